@@ -24,6 +24,7 @@ INPUT_TABLE = os.getenv('INPUT_TABLE', 'business_associates_raw')
 # Output Configuration
 OUTPUT_TABLE = os.getenv('OUTPUT_TABLE', 'business_associates_deduplicated')
 OUTPUT_AUDIT_TABLE = os.getenv('OUTPUT_AUDIT_TABLE', 'ba_dedup_audit')
+CSV_ENGINE = os.getenv('CSV_ENGINE', 'pandas')  # pandas (classic to_csv format) or pyarrow (faster, different quoting/format)
 
 # Deduplication Settings
 SIMILARITY_THRESHOLD = float(os.getenv('SIMILARITY_THRESHOLD', '0.85'))
@@ -61,7 +62,9 @@ OPTIONAL_FIELDS = {
 }
 
 # State management
-STATE_FILE = PROJECT_ROOT / 'state' / 'pipeline_state.json'
+STATE_FILE = Path(os.getenv('STATE_FILE', str(PROJECT_ROOT / 'state' / 'pipeline_state.json')))  # .msgpack suffix = binary state
+STATE_SAVE_INTERVAL = float(os.getenv('STATE_SAVE_INTERVAL', '0.5'))  # min seconds between state file writes (0 = every change)
+STATE_FSYNC = os.getenv('STATE_FSYNC', 'false').lower() == 'true'  # fsync each state write before it replaces the old file
 
 # Logging configuration
 LOG_DIR = PROJECT_ROOT / 'logs'
@@ -80,10 +83,14 @@ N_JOBS = int(os.getenv('N_JOBS', '-1'))  # -1 = use all cores
 # Chunking for large datasets
 ENABLE_CHUNKING = os.getenv('ENABLE_CHUNKING', 'true').lower() == 'true'
 CHUNK_SIZE = int(os.getenv('CHUNK_SIZE', '10000'))
+SCORING_BATCH_SIZE = int(os.getenv('SCORING_BATCH_SIZE', '500000'))  # candidate pairs scored per batch
 
 # Data type optimization
 OPTIMIZE_DTYPES = os.getenv('OPTIMIZE_DTYPES', 'true').lower() == 'true'
 
+# pandas Copy-on-Write for the skills pipeline (no defensive DataFrame copies)
+ENABLE_COPY_ON_WRITE = os.getenv('ENABLE_COPY_ON_WRITE', 'true').lower() == 'true'
+
 # Query profiling (debugging only - adds overhead)
 ENABLE_QUERY_PROFILING = os.getenv('ENABLE_QUERY_PROFILING', 'false').lower() == 'true'
 SLOW_QUERY_THRESHOLD = float(os.getenv('SLOW_QUERY_THRESHOLD', '1.0'))
@@ -93,3 +100,7 @@ DATABASE_PATH = os.getenv('DATABASE_PATH', str(PROJECT_ROOT / 'ba_dedup.db'))
 
 # Smart Blocking Settings (Priority 4 optimization)
 MAX_MISSING_DATA_PAIRS = int(os.getenv('MAX_MISSING_DATA_PAIRS', '50000'))  # Cap for missing data fallback
+USE_MINHASH_LSH = os.getenv('USE_MINHASH_LSH', 'false').lower() == 'true'  # Name-similarity blocking (needs datasketch)
+LSH_THRESHOLD = float(os.getenv('LSH_THRESHOLD', '0.7'))  # Jaccard threshold on name 3-grams
+LSH_NUM_PERM = int(os.getenv('LSH_NUM_PERM', '128'))  # MinHash permutations
+LSH_MAX_PAIRS = int(os.getenv('LSH_MAX_PAIRS', '50000'))  # Cap for MinHash LSH name blocking
@@ -7,6 +7,12 @@ from pathlib import Path
 from typing import Optional
 from utils.logger import get_logger
 
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
@@ -16,13 +22,48 @@ class FileReader:
     Provides robust reading with encoding detection and error handling.
     """
 
-    def read_csv(self, file_path: str, encoding: Optional[str] = None) -> pd.DataFrame:
+    def _parse_csv(self, file_path: Path, encoding: str, **kwargs) -> pd.DataFrame:
+        """
+        Parse a CSV with pyarrow's multithreaded reader when installed.
+
+        Falls back to the default pandas engine if pyarrow rejects the file
+        (invalid bytes for the encoding, ragged rows), so encoding errors still
+        surface as UnicodeDecodeError for the detection loop.
+        """
+        if PYARROW_AVAILABLE:
+            try:
+                df = pd.read_csv(file_path, encoding=encoding, engine='pyarrow', **kwargs)
+                # pyarrow keeps undecodable text as raw bytes instead of raising
+                if not self._has_binary_columns(df):
+                    return df
+            except (pa.ArrowException, ValueError) as e:
+                logger.debug(f"pyarrow CSV engine failed ({e}), retrying with pandas engine")
+        return pd.read_csv(file_path, encoding=encoding, **kwargs)
+
+    @staticmethod
+    def _has_binary_columns(df: pd.DataFrame) -> bool:
+        """Check for columns pyarrow could not decode with the given encoding."""
+        for col in df.columns:
+            dtype = df[col].dtype
+            if isinstance(dtype, pd.ArrowDtype):
+                if pa.types.is_binary(dtype.pyarrow_dtype):
+                    return True
+            elif dtype == object:
+                first = df[col].first_valid_index()
+                if first is not None and isinstance(df[col].at[first], bytes):
+                    return True
+        return False
+
+    def read_csv(self, file_path: str, encoding: Optional[str] = None,
+                 dtype_backend: Optional[str] = None) -> pd.DataFrame:
         """
         Read CSV file into a DataFrame.
 
         Args:
             file_path: Path to CSV file
             encoding: Optional encoding (auto-detected if None)
+            dtype_backend: Optional pandas dtype backend ('pyarrow' or
+                'numpy_nullable'); default keeps NumPy dtypes
 
         Returns:
             DataFrame with CSV contents
@@ -32,10 +73,12 @@ class FileReader:
         if not file_path.exists():
             raise FileNotFoundError(f"CSV file not found: {file_path}")
 
+        read_kwargs = {'dtype_backend': dtype_backend} if dtype_backend else {}
+
         try:
             # Try to read with specified or default encoding
             if encoding:
-                df = pd.read_csv(file_path, encoding=encoding)
+                df = self._parse_csv(file_path, encoding, **read_kwargs)
             else:
                 # Try common encodings
                 encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
@@ -43,7 +86,7 @@ class FileReader:
 
                 for enc in encodings:
                     try:
-                        df = pd.read_csv(file_path, encoding=enc)
+                        df = self._parse_csv(file_path, enc, **read_kwargs)
                         logger.info(f"Successfully read CSV with encoding: {enc}")
                         break
                     except (UnicodeDecodeError, UnicodeError):
@@ -51,7 +94,7 @@ class FileReader:
 
                 if df is None:
                     # Fallback: read with error handling
-                    df = pd.read_csv(file_path, encoding='utf-8', encoding_errors='replace')
+                    df = pd.read_csv(file_path, encoding='utf-8', encoding_errors='replace', **read_kwargs)
                     logger.warning("Read CSV with error replacement")
 
             logger.info(f"Read CSV: {file_path} ({len(df)} rows, {len(df.columns)} columns)")
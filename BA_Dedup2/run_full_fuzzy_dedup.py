@@ -127,6 +127,9 @@ print(f'\nApplied smart name parsing and normalization')
 df['zip_normalized'] = df['zip'].astype(str).str.replace(r'\D', '', regex=True).str[:5]
 
 # Step 5: Smart blocking to generate candidate pairs
+# Dense positional index so candidate pairs can address plain arrays directly
+df = df.reset_index(drop=True)
+
 print(f'\nGenerating candidate pairs with smart blocking...')
 strategy = SmartBlockingStrategy(max_missing_data_pairs=50000)
 candidate_pairs = strategy.generate_candidate_pairs(df)
@@ -139,12 +142,15 @@ print(f'\nPerforming fuzzy matching (similarity threshold: 85%)...')
 matches = []
 threshold = 85
 
+# Materialize the key column once; .loc per access dominates the fuzzy compare
+names_arr = df['name_match_key'].to_numpy(dtype=object)
+
 for i, (idx1, idx2) in enumerate(candidate_pairs):
     if i % 10000 == 0:
         print(f'  Processed {i:,}/{len(candidate_pairs):,} pairs...', end='\r')
 
-    name1 = df.loc[idx1, 'name_match_key']
-    name2 = df.loc[idx2, 'name_match_key']
+    name1 = names_arr[idx1]
+    name2 = names_arr[idx2]
 
     # Skip if either name is empty
     if not name1 or not name2:
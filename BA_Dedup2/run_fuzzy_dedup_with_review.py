@@ -2,13 +2,32 @@
 Fuzzy matching deduplication with human review flagging.
 Flags Trusts, Departments, and other sensitive entity types for manual review.
 """
+# Run pandas on the GPU when RAPIDS is installed; unsupported ops fall back to CPU.
+# Must be installed before pandas is first imported.
+try:
+    import cudf.pandas
+    cudf.pandas.install()
+except ImportError:
+    pass
+
 import pandas as pd
+import numpy as np
 import sys
 from pathlib import Path
 import re
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 from collections import defaultdict
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 sys.path.insert(0, str(Path.cwd()))
 
 from utils.logger import get_logger
@@ -17,12 +36,27 @@ from config.review_keywords import HUMAN_REVIEW_KEYWORDS, get_review_reason
 
 logger = get_logger(__name__)
 
+
+def write_csv(frame, path):
+    """Write a CSV with pyarrow's multithreaded writer, falling back to pandas."""
+    if PYARROW_AVAILABLE:
+        try:
+            pa_csv.write_csv(pa.Table.from_pandas(frame, preserve_index=False), path)
+            return
+        except pa.ArrowException as e:
+            logger.warning(f"pyarrow CSV write failed for {path}, using pandas: {e}")
+    frame.to_csv(path, index=False)
+
 print('='*80)
 print('FUZZY DEDUPLICATION WITH HUMAN REVIEW FLAGGING')
 print('='*80)
 
 # Load data
-df = pd.read_csv('input/sample_data.csv')
+# Read text fields as strings up front (keeps ZIP leading zeros) so the
+# normalizers below never need to coerce values with str()
+TEXT_COLUMNS = ['name', 'address', 'city', 'state', 'zip', 'phone', 'email', 'contact_person']
+text_dtype = 'string[pyarrow]' if PYARROW_AVAILABLE else 'string'
+df = pd.read_csv('input/sample_data.csv', dtype={col: text_dtype for col in TEXT_COLUMNS})
 print(f'\nStarting with: {len(df):,} records')
 
 # Remove exact duplicates
@@ -30,97 +64,106 @@ df = df.drop_duplicates()
 print(f'After removing exact duplicates: {len(df):,} records')
 
 # Smart name parsing (same as before)
+NAME_WHITESPACE_RE = re.compile(r'\s+')
+ENTITY_SUFFIXES = frozenset([
+    'LLC', 'L.L.C', 'LP', 'L.P', 'INC', 'CORP', 'LTD',
+    'PLLC', 'PC', 'PA', 'CORPORATION', 'COMPANY', 'CO',
+    'INCORPORATED', 'LIMITED', 'LLP', 'TRUST', 'TR'
+])
+COMPANY_INDICATORS = ('PROPERTIES', 'ASSOCIATES', 'PARTNERS', 'GROUP',
+                      'VENTURES', 'HOLDINGS', 'MANAGEMENT', 'SERVICES',
+                      'ENERGY', 'OIL', 'GAS', 'PETROLEUM', 'MEDICAL',
+                      'HEALTH', 'HOSPITAL', 'CLINIC', 'CARE')
+
 def normalize_name(name):
     """Parse and normalize business names."""
     if pd.isna(name) or name == '':
         return name
 
-    name_str = str(name).strip()
-    name_str = re.sub(r'[\r\n]+', ' ', name_str)
-    name_str = re.sub(r'\s+', ' ', name_str).strip()
-
-    entity_suffixes = [
-        'LLC', 'L.L.C', 'LP', 'L.P', 'INC', 'CORP', 'LTD',
-        'PLLC', 'PC', 'PA', 'CORPORATION', 'COMPANY', 'CO',
-        'INCORPORATED', 'LIMITED', 'LLP', 'TRUST', 'TR'
-    ]
+    # \s covers CR/LF, so one collapse handles line breaks and repeated spaces
+    name_str = NAME_WHITESPACE_RE.sub(' ', name).strip()
 
-    if ',' in name_str:
-        parts = name_str.split(',', 1)
-        if len(parts) == 2:
-            first_part = parts[0].strip()
-            second_part = parts[1].strip()
+    # Most names have no comma: nothing to reorder
+    if ',' not in name_str:
+        return name_str
 
-            second_upper = second_part.upper().replace('.', '')
-            if second_upper in entity_suffixes:
-                return name_str
+    parts = name_str.split(',', 1)
+    if len(parts) == 2:
+        first_part = parts[0].strip()
+        second_part = parts[1].strip()
 
-            company_indicators = ['PROPERTIES', 'ASSOCIATES', 'PARTNERS', 'GROUP',
-                                 'VENTURES', 'HOLDINGS', 'MANAGEMENT', 'SERVICES',
-                                 'ENERGY', 'OIL', 'GAS', 'PETROLEUM', 'MEDICAL',
-                                 'HEALTH', 'HOSPITAL', 'CLINIC', 'CARE']
+        second_upper = second_part.upper().replace('.', '')
+        if second_upper in ENTITY_SUFFIXES:
+            return name_str
 
-            first_upper = first_part.upper()
-            if any(indicator in first_upper for indicator in company_indicators):
-                return name_str
+        first_upper = first_part.upper()
+        if any(indicator in first_upper for indicator in COMPANY_INDICATORS):
+            return name_str
 
-            if first_part and first_part[0].isdigit():
-                return name_str
+        if first_part and first_part[0].isdigit():
+            return name_str
 
-            if second_part and len(second_part) > 1:
-                return f'{second_part} {first_part}'
+        if second_part and len(second_part) > 1:
+            return f'{second_part} {first_part}'
 
     return name_str
 
+# Match-key vocabulary, built once at import instead of on every call
+MATCH_KEY_STRIP_RE = re.compile(r'[^A-Z0-9\s]')
+MATCH_KEY_SUFFIXES = frozenset(['LLC', 'INC', 'CORP', 'LTD', 'LP', 'CORPORATION',
+                                'INCORPORATED', 'COMPANY', 'LIMITED', 'CO'])
+MATCH_KEY_ABBREVS = {
+    'ASSOC': 'ASSOCIATES',
+    'ASSOCS': 'ASSOCIATES',
+    'GRP': 'GROUP',
+    'CTR': 'CENTER',
+    'CNTR': 'CENTER',
+    'HOSP': 'HOSPITAL',
+    'MED': 'MEDICAL',
+    'MGMT': 'MANAGEMENT',
+    'SVCS': 'SERVICES'
+}
+
 def create_match_key(name):
     """Create normalized key for fuzzy matching."""
     if pd.isna(name) or name == '':
         return ''
 
-    s = str(name).upper()
-    s = re.sub(r'[^A-Z0-9\s]', '', s)
-
-    suffixes = ['LLC', 'INC', 'CORP', 'LTD', 'LP', 'CORPORATION',
-                'INCORPORATED', 'COMPANY', 'LIMITED', 'CO']
-    for suffix in suffixes:
-        s = re.sub(r'\b' + suffix + r'\b', '', s)
-
-    abbrevs = {
-        'ASSOC': 'ASSOCIATES',
-        'ASSOCS': 'ASSOCIATES',
-        'GRP': 'GROUP',
-        'CTR': 'CENTER',
-        'CNTR': 'CENTER',
-        'HOSP': 'HOSPITAL',
-        'MED': 'MEDICAL',
-        'MGMT': 'MANAGEMENT',
-        'SVCS': 'SERVICES'
-    }
-    for abbr, full in abbrevs.items():
-        s = re.sub(r'\b' + abbr + r'\b', full, s)
-
-    s = re.sub(r'\s+', ' ', s).strip()
-    return s
+    # Only A-Z, 0-9 and whitespace survive the strip, so whitespace tokens are
+    # exactly the \b-delimited words: drop suffixes, expand abbreviations
+    tokens = MATCH_KEY_STRIP_RE.sub('', name.upper()).split()
+    return ' '.join(MATCH_KEY_ABBREVS.get(token, token)
+                    for token in tokens if token not in MATCH_KEY_SUFFIXES)
 
 # Apply normalizations
 df['name_original'] = df['name']
-df['name_parsed'] = df['name'].apply(normalize_name)
-df['name_match_key'] = df['name_parsed'].apply(create_match_key)
+
+# Parse and key each distinct raw name in a single pass; factorize codes
+# missing names as -1, which picks up the trailing NaN / '' entries
+name_codes, unique_names = pd.factorize(df['name'])
+unique_parsed, unique_keys = [], []
+for name in unique_names:
+    parsed = normalize_name(name)
+    unique_parsed.append(parsed)
+    unique_keys.append(create_match_key(parsed))
+
+df['name_parsed'] = np.array(unique_parsed + [np.nan], dtype=object)[name_codes]
+df['name_match_key'] = np.array(unique_keys + [''], dtype=object)[name_codes]
 
 # NEW: Flag records that need human review
+# All keywords compiled into one alternation so each name is scanned once,
+# not once per keyword (word boundaries avoid partial matches)
+REVIEW_KEYWORD_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(keyword.upper()) for keyword in HUMAN_REVIEW_KEYWORDS) + r')\b'
+)
+
 def check_needs_review(name):
     """Check if name contains keywords requiring human review."""
     if pd.isna(name) or name == '':
         return False, []
 
-    name_upper = str(name).upper()
-    matched_keywords = []
-
-    for keyword in HUMAN_REVIEW_KEYWORDS:
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(keyword.upper()) + r'\b'
-        if re.search(pattern, name_upper):
-            matched_keywords.append(keyword)
+    found = set(REVIEW_KEYWORD_RE.findall(name.upper()))
+    matched_keywords = [keyword for keyword in HUMAN_REVIEW_KEYWORDS if keyword.upper() in found]
 
     return len(matched_keywords) > 0, matched_keywords
 
@@ -137,9 +180,12 @@ print(f'Records for automatic processing: {len(auto_process):,}')
 print(f'Records requiring human review: {len(human_review):,}')
 
 if len(human_review) > 0:
+    # Records per keyword (each keyword appears at most once per record)
+    keyword_counts = human_review['review_keywords'].explode().value_counts()
+
     print(f'\nHuman review breakdown:')
     for keyword in HUMAN_REVIEW_KEYWORDS:
-        count = sum(keyword in str(kw_list) for kw_list in human_review['review_keywords'])
+        count = keyword_counts.get(keyword, 0)
         if count > 0:
             print(f'  - {keyword}: {count:,} records')
 
@@ -148,65 +194,85 @@ if len(human_review) > 0:
         keywords = ', '.join(row['review_keywords'])
         print(f'  - {row["name_parsed"]} (contains: {keywords})')
 
+# Completeness = number of non-null, non-blank contact fields per record
+COMPLETENESS_COLUMNS = ['address', 'city', 'state', 'zip', 'phone', 'email', 'contact_person']
+
+def completeness_scores(frame):
+    """Score every row at once with column-wise vectorized ops."""
+    cols = [col for col in COMPLETENESS_COLUMNS if col in frame.columns]
+    filled = frame[cols].apply(lambda col: col.notna() & (col.str.strip() != ''))
+    return filled.sum(axis=1)
+
 # Process auto-process records with fuzzy matching
 print(f'\n{"="*80}')
 print('PROCESSING AUTO-MERGE RECORDS')
 print('='*80)
 
 if len(auto_process) > 0:
+    # Dense positional index so candidate pairs address NumPy arrays directly
+    auto_process = auto_process.reset_index(drop=True)
+
     # Add normalized ZIP for blocking
-    auto_process['zip_normalized'] = auto_process['zip'].astype(str).str.replace(r'\D', '', regex=True).str[:5]
+    auto_process['zip_normalized'] = auto_process['zip'].str.replace(r'\D', '', regex=True).str[:5].fillna('')
 
     # Smart blocking
     print(f'\nGenerating candidate pairs with smart blocking...')
+    # MinHash LSH name blocking follows settings.USE_MINHASH_LSH
     strategy = SmartBlockingStrategy(max_missing_data_pairs=50000)
-    candidate_pairs = strategy.generate_candidate_pairs(auto_process)
-    print(f'Generated {len(candidate_pairs):,} candidate pairs')
+    pair_arr = strategy.generate_candidate_pair_array(auto_process)
+    print(f'Generated {len(pair_arr):,} candidate pairs')
 
     # Fuzzy matching
     print(f'\nPerforming fuzzy matching (similarity threshold: 85%)...')
-    matches = []
     threshold = 85
-
-    for i, (idx1, idx2) in enumerate(candidate_pairs):
-        if i % 10000 == 0:
-            print(f'  Processed {i:,}/{len(candidate_pairs):,} pairs...', end='\r')
-
-        name1 = auto_process.loc[idx1, 'name_match_key']
-        name2 = auto_process.loc[idx2, 'name_match_key']
-
-        if not name1 or not name2:
-            continue
-
-        similarity = fuzz.token_sort_ratio(name1, name2)
-
-        if similarity >= threshold:
-            matches.append((idx1, idx2, similarity))
+    chunk_size = 100000
+
+    names_arr = auto_process['name_match_key'].to_numpy(dtype=object)
+
+    # Rows sharing a match key always score the same, so score each distinct
+    # (key, key) pair once and expand the verdict back to the row pairs
+    keys_unique, key_codes = np.unique(names_arr.astype(str), return_inverse=True)
+    key_lens = np.char.str_len(keys_unique)
+    code_pairs = np.sort(key_codes.ravel()[pair_arr], axis=1)
+    key_pairs, pair_inverse = np.unique(code_pairs, axis=0, return_inverse=True)
+    key_pair_matches = np.zeros(len(key_pairs), dtype=bool)
+    print(f'Scoring {len(key_pairs):,} distinct name-key pairs')
+
+    # cpdist scores each (name1, name2) pair in C++ across all cores (workers=-1),
+    # so no per-pair Python work and no process pickling is needed
+    for start in range(0, len(key_pairs), chunk_size):
+        print(f'  Processed {start:,}/{len(key_pairs):,} pairs...', end='\r')
+
+        chunk = key_pairs[start:start + chunk_size]
+        names1 = keys_unique[chunk[:, 0]]
+        names2 = keys_unique[chunk[:, 1]]
+
+        # Skip pairs where either name is empty, or whose lengths alone rule out
+        # the threshold: token_sort_ratio <= 200 * min(len) / (len1 + len2)
+        len1 = key_lens[chunk[:, 0]]
+        len2 = key_lens[chunk[:, 1]]
+        valid = (len1 > 0) & (len2 > 0) & (200 * np.minimum(len1, len2) >= threshold * (len1 + len2))
+
+        similarity = process.cpdist(
+            names1[valid], names2[valid],
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=threshold,
+            workers=-1
+        )
+        key_pair_matches[start + np.flatnonzero(valid)] = similarity >= threshold
+
+    matches = pair_arr[key_pair_matches[pair_inverse.ravel()]]
 
     print(f'\nFound {len(matches):,} matching pairs above {threshold}% similarity')
 
-    # Build clusters
-    class UnionFind:
-        def __init__(self):
-            self.parent = {}
-
-        def find(self, x):
-            if x not in self.parent:
-                self.parent[x] = x
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x]
-
-        def union(self, x, y):
-            px, py = self.find(x), self.find(y)
-            if px != py:
-                self.parent[px] = py
-
-    uf = UnionFind()
-    for idx1, idx2, score in matches:
-        uf.union(idx1, idx2)
-
-    auto_process['cluster_id'] = auto_process.index.map(lambda x: uf.find(x))
+    # Build clusters: connected components of the match graph (C union-find in scipy)
+    n_records = len(auto_process)
+    match_graph = coo_matrix(
+        (np.ones(len(matches)), (matches[:, 0], matches[:, 1])),
+        shape=(n_records, n_records)
+    ).tocsr()
+    _, cluster_labels = connected_components(match_graph, directed=False)
+    auto_process['cluster_id'] = cluster_labels
 
     clusters = auto_process.groupby('cluster_id').size()
     multi_record_clusters = clusters[clusters > 1]
@@ -217,14 +283,7 @@ if len(auto_process) > 0:
     print(f'  Duplicates merged: {multi_record_clusters.sum() - len(multi_record_clusters):,}')
 
     # Create golden records
-    def completeness_score(row):
-        score = 0
-        for col in ['address', 'city', 'state', 'zip', 'phone', 'email', 'contact_person']:
-            if pd.notna(row.get(col)) and str(row.get(col)).strip() != '':
-                score += 1
-        return score
-
-    auto_process['_completeness'] = auto_process.apply(completeness_score, axis=1)
+    auto_process['_completeness'] = completeness_scores(auto_process)
     golden_auto = auto_process.sort_values('_completeness', ascending=False).drop_duplicates('cluster_id', keep='first')
 
     print(f'\nGolden records (auto-merged): {len(golden_auto):,}')
@@ -236,7 +295,7 @@ else:
 # For human review records, assign unique cluster IDs (no auto-merge)
 if len(human_review) > 0:
     human_review['cluster_id'] = range(len(auto_process), len(auto_process) + len(human_review))
-    human_review['_completeness'] = human_review.apply(completeness_score if len(auto_process) > 0 else lambda x: 0, axis=1)
+    human_review['_completeness'] = completeness_scores(human_review)
 
 # Combine results
 all_processed = pd.concat([auto_process, human_review], ignore_index=True)
@@ -257,24 +316,35 @@ if len(golden_auto) > 0:
     golden_clean = golden_auto[['name_parsed', 'address', 'city', 'state', 'zip',
                                  'phone', 'email', 'contact_person']].copy()
     golden_clean = golden_clean.rename(columns={'name_parsed': 'name'})
-    golden_clean.to_csv('output/golden_records_auto_merged.csv', index=False)
+    write_csv(golden_clean, 'output/golden_records_auto_merged.csv')
 
 # 2. Human review records
 if len(human_review) > 0:
     review_output = human_review[['name_original', 'name_parsed', 'address', 'city', 'state', 'zip',
                                    'phone', 'email', 'contact_person', 'review_keywords']].copy()
+    # Keywords come from a small fixed list, so look every reason up once
+    review_reasons = {keyword: get_review_reason(keyword) for keyword in HUMAN_REVIEW_KEYWORDS}
     review_output['review_reason'] = review_output['review_keywords'].apply(
-        lambda kw_list: ' | '.join([get_review_reason(kw) for kw in kw_list])
+        lambda kw_list: ' | '.join([review_reasons[kw] for kw in kw_list])
     )
+    review_output['review_keywords'] = review_output['review_keywords'].map(str)
     review_output = review_output.rename(columns={'name_parsed': 'name'})
-    review_output.to_csv('output/HUMAN_REVIEW_REQUIRED.csv', index=False)
+    write_csv(review_output, 'output/HUMAN_REVIEW_REQUIRED.csv')
 
 # 3. All locations with cluster mapping
 locations = all_processed[['cluster_id', 'name_original', 'name_parsed', 'address',
                             'city', 'state', 'zip', 'phone', 'email', 'contact_person',
                             'needs_review', 'review_keywords']].copy()
 locations = locations.sort_values(['needs_review', 'cluster_id', 'state', 'city'])
-locations.to_csv('output/all_locations_with_review_flags.csv', index=False)
+if PYARROW_AVAILABLE:
+    # Columnar copy for downstream tools; keeps review_keywords as a native list column
+    try:
+        pq.write_table(pa.Table.from_pandas(locations, preserve_index=False),
+                       'output/all_locations_with_review_flags.parquet')
+    except pa.ArrowException as e:
+        logger.warning(f"Could not write parquet copy of locations: {e}")
+write_csv(locations.assign(review_keywords=locations['review_keywords'].map(str)),
+          'output/all_locations_with_review_flags.csv')
 
 # 4. Summary report
 with open('output/DEDUPLICATION_SUMMARY.txt', 'w') as f:
@@ -295,7 +365,7 @@ with open('output/DEDUPLICATION_SUMMARY.txt', 'w') as f:
     if len(human_review) > 0:
         f.write(f'  Breakdown by keyword:\n')
         for keyword in HUMAN_REVIEW_KEYWORDS:
-            count = sum(keyword in str(kw_list) for kw_list in human_review['review_keywords'])
+            count = keyword_counts.get(keyword, 0)
             if count > 0:
                 f.write(f'    - {keyword}: {count:,} records\n')
 
@@ -318,6 +388,8 @@ print(f'   - Contains Trusts, Departments, and other flagged entities')
 print('')
 print('3. output/all_locations_with_review_flags.csv')
 print(f'   - {len(locations):,} total locations with review flags')
+if PYARROW_AVAILABLE:
+    print('   - Also saved as output/all_locations_with_review_flags.parquet')
 print('')
 print('4. output/DEDUPLICATION_SUMMARY.txt')
 print('   - Summary report of all processing')
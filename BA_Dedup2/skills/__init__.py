@@ -1,7 +1,21 @@
 """
 Reusable skills extracted from BA deduplication agents.
 Each skill is a standalone, callable function or class that can be used independently.
+
+With settings.ENABLE_COPY_ON_WRITE (default on), importing the skills turns on
+pandas Copy-on-Write: column selections and slices share data until written,
+so skills never need defensive .copy() calls. Callers must not rely on writes
+through a derived frame/Series (or its .to_numpy() view) reaching the parent.
 """
+import pandas as pd
+from config import settings
+
+if settings.ENABLE_COPY_ON_WRITE:
+    try:
+        pd.set_option('mode.copy_on_write', True)
+    except (AttributeError, KeyError):
+        # pandas < 1.5 has no Copy-on-Write mode
+        pass
 
 # Ingestion skills
 from .ingestion_skills import (
@@ -21,6 +35,7 @@ from .validation_skills import (
     standardize_phone,
     standardize_zip,
     standardize_email,
+    standardize_all_fields,
     parse_name_components,
     extract_entity_type,
     validate_data_quality,
@@ -43,6 +58,7 @@ from .merge_skills import (
     merge_cluster,
     select_best_values,
     calculate_completeness_score,
+    calculate_completeness_scores_df,
     merge_all_clusters
 )
 
@@ -71,6 +87,7 @@ __all__ = [
     'standardize_phone',
     'standardize_zip',
     'standardize_email',
+    'standardize_all_fields',
     'parse_name_components',
     'extract_entity_type',
     'validate_data_quality',
@@ -89,6 +106,7 @@ __all__ = [
     'merge_cluster',
     'select_best_values',
     'calculate_completeness_score',
+    'calculate_completeness_scores_df',
     'merge_all_clusters',
 
     # Output
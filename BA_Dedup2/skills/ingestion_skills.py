@@ -12,13 +12,18 @@ from utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-def read_csv_file(file_path: str, encoding: str = 'utf-8') -> pd.DataFrame:
+def read_csv_file(file_path: str, encoding: str = 'utf-8',
+                  dtype_backend: Optional[str] = None) -> pd.DataFrame:
     """
     Read data from CSV file.
 
+    Parsing uses the pyarrow engine when pyarrow is installed.
+
     Args:
         file_path: Path to CSV file
         encoding: File encoding (default: utf-8)
+        dtype_backend: Optional dtype backend, e.g. 'pyarrow' for Arrow-backed
+            columns (default: NumPy dtypes)
 
     Returns:
         DataFrame with CSV data
@@ -28,7 +33,7 @@ def read_csv_file(file_path: str, encoding: str = 'utf-8') -> pd.DataFrame:
     """
     logger.info(f"Reading CSV file: {file_path}")
     file_reader = FileReader()
-    df = file_reader.read_csv(file_path, encoding=encoding)
+    df = file_reader.read_csv(file_path, encoding=encoding, dtype_backend=dtype_backend)
     logger.info(f"Read {len(df)} records from CSV")
     return df
 
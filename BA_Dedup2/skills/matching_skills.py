@@ -4,13 +4,26 @@ Extracted from MatchingAgent for standalone use.
 """
 import pandas as pd
 import numpy as np
-from typing import List, Tuple, Dict
-from thefuzz import fuzz
+from typing import List, Tuple, Dict, Union
+from rapidfuzz import fuzz, process
+from rapidfuzz import utils as fuzz_utils
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from config import settings
+from utils.helpers import nonempty_mask
 from utils.logger import get_logger
 from utils.smart_blocking import SmartBlockingStrategy
 
 logger = get_logger(__name__)
 
+# thefuzz's force_ascii step: drop Latin-1 supplement characters before processing
+_NON_ASCII_TABLE = {i: None for i in range(128, 256)}
+
+
+def _full_process(value: str) -> str:
+    """Lowercase, trim and strip punctuation exactly like thefuzz's full_process."""
+    return fuzz_utils.default_process(value.translate(_NON_ASCII_TABLE))
+
 
 def fuzzy_match_names(name1: str, name2: str, threshold: float = 0.85) -> Tuple[bool, float]:
     """
@@ -31,7 +44,7 @@ def fuzzy_match_names(name1: str, name2: str, threshold: float = 0.85) -> Tuple[
     if not name1 or not name2:
         return False, 0.0
 
-    score = fuzz.token_sort_ratio(str(name1), str(name2)) / 100.0
+    score = round(fuzz.token_sort_ratio(str(name1), str(name2), processor=_full_process)) / 100.0
     is_match = score >= threshold
 
     return is_match, score
@@ -59,7 +72,7 @@ def fuzzy_match_addresses(addr1: str, addr2: str, threshold: float = 0.80) -> Tu
     if not addr1 or not addr2:
         return False, 0.0
 
-    score = fuzz.token_sort_ratio(str(addr1), str(addr2)) / 100.0
+    score = round(fuzz.token_sort_ratio(str(addr1), str(addr2), processor=_full_process)) / 100.0
     is_match = score >= threshold
 
     return is_match, score
@@ -68,8 +81,9 @@ def fuzzy_match_addresses(addr1: str, addr2: str, threshold: float = 0.80) -> Tu
 def apply_blocking_strategy(
     df: pd.DataFrame,
     blocking_fields: List[str] = None,
-    max_pairs: int = 50000
-) -> List[Tuple[int, int]]:
+    max_pairs: int = 50000,
+    as_array: bool = False
+) -> Union[List[Tuple[int, int]], np.ndarray]:
     """
     Generate candidate pairs using smart blocking strategy.
 
@@ -77,9 +91,10 @@ def apply_blocking_strategy(
         df: Input DataFrame with records
         blocking_fields: Fields to use for blocking (default: ['state', 'zip_normalized'])
         max_pairs: Maximum number of pairs to generate
+        as_array: If True, return an (N, 2) integer array instead of a list of tuples
 
     Returns:
-        List of (index1, index2) candidate pairs
+        List of (index1, index2) candidate pairs (or an (N, 2) array if as_array)
 
     Example:
         pairs = apply_blocking_strategy(df, blocking_fields=['state', 'zip'], max_pairs=100000)
@@ -91,7 +106,10 @@ def apply_blocking_strategy(
     logger.info(f"Applying blocking strategy on fields: {blocking_fields}")
 
     strategy = SmartBlockingStrategy(max_missing_data_pairs=max_pairs)
-    candidate_pairs = strategy.generate_candidate_pairs(df)
+    if as_array:
+        candidate_pairs = strategy.generate_candidate_pair_array(df)
+    else:
+        candidate_pairs = strategy.generate_candidate_pairs(df)
 
     logger.info(f"Generated {len(candidate_pairs)} candidate pairs")
 
@@ -101,8 +119,9 @@ def apply_blocking_strategy(
 def generate_candidate_pairs(
     df: pd.DataFrame,
     blocking_fields: List[str] = None,
-    max_pairs: int = 50000
-) -> List[Tuple[int, int]]:
+    max_pairs: int = 50000,
+    as_array: bool = False
+) -> Union[List[Tuple[int, int]], np.ndarray]:
     """
     Alias for apply_blocking_strategy for backward compatibility.
 
@@ -110,6 +129,7 @@ def generate_candidate_pairs(
         df: Input DataFrame
         blocking_fields: Fields to use for blocking
         max_pairs: Maximum pairs to generate
+        as_array: If True, return an (N, 2) integer array instead of a list of tuples
 
     Returns:
         List of candidate pairs
@@ -117,23 +137,179 @@ def generate_candidate_pairs(
     Example:
         pairs = generate_candidate_pairs(df, blocking_fields=['state', 'city'])
     """
-    return apply_blocking_strategy(df, blocking_fields, max_pairs)
+    return apply_blocking_strategy(df, blocking_fields, max_pairs, as_array)
+
+
+def _prepare_field(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split a field into compact int32 codes per row plus a pool holding each
+    distinct value once, ready for token_sort_ratio (thefuzz-style processing,
+    tokens sorted). Missing or blank values get code -1.
+    """
+    present = nonempty_mask(values)
+    codes, uniques = pd.factorize(np.where(present, values.astype(str), None))
+    pool = np.array(
+        [' '.join(sorted(_full_process(value).split())) for value in uniques],
+        dtype=object
+    )
+    return codes.astype(np.int32), pool
+
+
+def _score_pair_batch(
+    fields: List[Tuple[np.ndarray, np.ndarray]],
+    pos1: np.ndarray,
+    pos2: np.ndarray,
+    threshold: float,
+    n_jobs: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Average field scores for one batch of pairs given as row positions.
+
+    Returns (avg_scores, scored) where scored marks pairs with at least one
+    field present on both records.
+    """
+    score_sums = np.zeros(len(pos1))
+    field_counts = np.zeros(len(pos1), dtype=np.int64)
+
+    # Gather every field's codes first so each pair's number of scored fields
+    # (the denominator of its average) is known before any scoring
+    batch_fields = []
+    for codes, pool in fields:
+        codes1 = codes[pos1]
+        codes2 = codes[pos2]
+
+        # Only fields present on both records count towards the average
+        present = (codes1 >= 0) & (codes2 >= 0)
+        field_counts += present
+        batch_fields.append((pool, codes1, codes2, present))
+
+    # Score one field at a time for all pairs: rapidfuzz's cpdist compares
+    # the two aligned lists in C++ on n_jobs threads (GIL released) instead of a Python loop
+    fields_left = field_counts.copy()
+    target_sums = threshold * field_counts
+    for pool, codes1, codes2, present in batch_fields:
+        fields_left -= present
+
+        # Skip pairs that cannot reach the threshold even if this and every
+        # later field scored 1.0
+        alive = present & (score_sums + 1 + fields_left >= target_sums - 1e-9)
+        if not alive.any():
+            continue
+
+        # Scores below the smallest amount any live pair still needs cannot
+        # produce a match, so rapidfuzz may exit early on them (the 0.5 covers
+        # rounding to whole numbers below)
+        needed = (target_sums[alive] - score_sums[alive] - fields_left[alive]).min()
+        score_cutoff = max(0.0, needed * 100 - 0.5 - 1e-6)
+
+        # Many pairs compare the same two prepared strings; score each distinct
+        # (unordered) string pair once and scatter the result back. ratio is
+        # symmetric, so (a, b) and (b, a) share one slot
+        a_codes = codes1[alive].astype(np.int64)
+        b_codes = codes2[alive].astype(np.int64)
+        pair_keys = np.minimum(a_codes, b_codes) * len(pool) + np.maximum(a_codes, b_codes)
+        unique_keys, pair_slot = np.unique(pair_keys, return_inverse=True)
+        unique_a = unique_keys // len(pool)
+        unique_b = unique_keys % len(pool)
+
+        # Equal codes mean identical prepared strings, which always score 100;
+        # only the remaining pairs need rapidfuzz
+        field_scores = np.full(len(unique_keys), 100.0)
+        differ = unique_a != unique_b
+        if len(pool) ** 2 <= differ.sum():
+            # Low-cardinality fields (state, ZIP, phone prefix...): scoring
+            # the whole distinct-value matrix once is cheaper than the pairs
+            pool_scores = process.cdist(
+                pool, pool,
+                scorer=fuzz.ratio,
+                score_cutoff=score_cutoff,
+                dtype=np.float64,
+                workers=n_jobs
+            )
+            field_scores[differ] = pool_scores[unique_a[differ], unique_b[differ]]
+        elif differ.any():
+            field_scores[differ] = process.cpdist(
+                pool[unique_a[differ]], pool[unique_b[differ]],
+                scorer=fuzz.ratio,
+                score_cutoff=score_cutoff,
+                dtype=np.float64,
+                workers=n_jobs
+            )
+        # thefuzz returned whole-number scores; round so thresholds behave the same
+        score_sums[alive] += np.round(field_scores)[pair_slot] / 100.0
+
+    # Average score across all fields
+    scored = field_counts > 0
+    avg_scores = np.zeros(len(pos1))
+    avg_scores[scored] = score_sums[scored] / field_counts[scored]
+
+    return avg_scores, scored
+
+
+def _score_candidate_pairs(
+    df: pd.DataFrame,
+    candidate_pairs: Union[List[Tuple[int, int]], np.ndarray],
+    match_fields: List[str],
+    threshold: float,
+    n_jobs: int,
+    batch_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score candidate pairs batch by batch and keep only the matches.
+
+    Returns (match_labels, match_scores): an (M, 2) array of index labels and
+    the matching average scores. Intermediate arrays are sized by batch_size,
+    not by the total number of candidate pairs.
+    """
+    pair_labels = np.asarray(candidate_pairs).reshape(-1, 2)
+
+    # Resolve labels to row positions once; field lookups below are then
+    # NumPy gathers rather than pandas label indexing
+    pos1 = df.index.get_indexer(pair_labels[:, 0])
+    pos2 = df.index.get_indexer(pair_labels[:, 1])
+
+    # Process and token-sort each distinct value once; token_sort_ratio on
+    # the raw pair is then a plain ratio on the prepared strings
+    fields = [
+        _prepare_field(df[field].to_numpy(dtype=object))
+        for field in match_fields
+        if field in df.columns
+    ]
+
+    match_labels = []
+    match_scores = []
+    for start in range(0, len(pair_labels), batch_size):
+        batch = slice(start, start + batch_size)
+        avg_scores, scored = _score_pair_batch(fields, pos1[batch], pos2[batch], threshold, n_jobs)
+
+        is_match = scored & (avg_scores >= threshold)
+        match_labels.append(pair_labels[batch][is_match])
+        match_scores.append(avg_scores[is_match])
+
+    if not match_labels:
+        return pair_labels[:0], np.zeros(0)
+
+    return np.concatenate(match_labels), np.concatenate(match_scores)
 
 
 def calculate_similarity_scores(
     df: pd.DataFrame,
-    candidate_pairs: List[Tuple[int, int]],
+    candidate_pairs: Union[List[Tuple[int, int]], np.ndarray],
     match_fields: List[str] = None,
-    threshold: float = 0.85
+    threshold: float = 0.85,
+    n_jobs: int = None,
+    batch_size: int = None
 ) -> List[Tuple[int, int, float]]:
     """
     Calculate similarity scores for candidate pairs.
 
     Args:
         df: Input DataFrame
-        candidate_pairs: List of (index1, index2) pairs to compare
+        candidate_pairs: List of (index1, index2) pairs, or an (N, 2) array, to compare
         match_fields: Fields to use for matching (default: ['name_normalized', 'address_normalized'])
         threshold: Minimum similarity threshold
+        n_jobs: Scoring threads for rapidfuzz (-1 = all cores, default: settings.N_JOBS)
+        batch_size: Pairs scored per batch (default: settings.SCORING_BATCH_SIZE)
 
     Returns:
         List of (index1, index2, score) for pairs above threshold
@@ -145,52 +321,37 @@ def calculate_similarity_scores(
     """
     if match_fields is None:
         match_fields = ['name_normalized', 'address_normalized']
+    if n_jobs is None:
+        n_jobs = settings.N_JOBS
+    if batch_size is None:
+        batch_size = settings.SCORING_BATCH_SIZE
 
     logger.info(f"Calculating similarity scores for {len(candidate_pairs)} pairs")
     logger.info(f"Match fields: {match_fields}, Threshold: {threshold}")
 
-    matches = []
-
-    for i, (idx1, idx2) in enumerate(candidate_pairs):
-        if i % 10000 == 0 and i > 0:
-            logger.debug(f"Processed {i}/{len(candidate_pairs)} pairs...")
-
-        scores = []
-
-        # Calculate similarity for each match field
-        for field in match_fields:
-            if field not in df.columns:
-                continue
-
-            val1 = df.loc[idx1, field]
-            val2 = df.loc[idx2, field]
-
-            if pd.isna(val1) or pd.isna(val2) or str(val1).strip() == '' or str(val2).strip() == '':
-                continue
-
-            # Use token_sort_ratio for fuzzy matching
-            score = fuzz.token_sort_ratio(str(val1), str(val2)) / 100.0
-            scores.append(score)
-
-        # Calculate average score across all fields
-        if scores:
-            avg_score = sum(scores) / len(scores)
-
-            if avg_score >= threshold:
-                matches.append((idx1, idx2, avg_score))
+    match_labels, match_scores = _score_candidate_pairs(
+        df, candidate_pairs, match_fields, threshold, n_jobs, batch_size
+    )
+    matches = [
+        (idx1, idx2, score)
+        for (idx1, idx2), score in zip(match_labels.tolist(), match_scores.tolist())
+    ]
 
     logger.info(f"Found {len(matches)} matching pairs above threshold {threshold}")
 
     return matches
 
 
-def cluster_duplicates(df: pd.DataFrame, duplicate_pairs: List[Tuple[int, int]]) -> pd.DataFrame:
+def cluster_duplicates(
+    df: pd.DataFrame,
+    duplicate_pairs: Union[List[Tuple[int, int]], np.ndarray]
+) -> pd.DataFrame:
     """
-    Cluster duplicate pairs into groups using Union-Find algorithm.
+    Cluster duplicate pairs into groups (connected components of the match graph).
 
     Args:
         df: Input DataFrame
-        duplicate_pairs: List of (index1, index2) duplicate pairs
+        duplicate_pairs: List of (index1, index2) duplicate pairs, or an (N, 2) array
 
     Returns:
         DataFrame with 'cluster_id' column added (-1 for singletons)
@@ -203,34 +364,28 @@ def cluster_duplicates(df: pd.DataFrame, duplicate_pairs: List[Tuple[int, int]])
     """
     logger.info(f"Clustering {len(duplicate_pairs)} duplicate pairs")
 
-    # Union-Find data structure
-    class UnionFind:
-        def __init__(self):
-            self.parent = {}
-
-        def find(self, x):
-            if x not in self.parent:
-                self.parent[x] = x
-            if self.parent[x] != x:
-                self.parent[x] = self.find(self.parent[x])
-            return self.parent[x]
-
-        def union(self, x, y):
-            px, py = self.find(x), self.find(y)
-            if px != py:
-                self.parent[px] = py
-
-    # Build clusters
-    uf = UnionFind()
-    for idx1, idx2 in duplicate_pairs:
-        uf.union(idx1, idx2)
-
-    # Assign cluster IDs
-    df['cluster_id'] = df.index.map(lambda x: uf.find(x) if x in uf.parent else -1)
-
-    # Count clusters and duplicates
-    duplicate_count = (df['cluster_id'] != -1).sum()
-    cluster_count = df[df['cluster_id'] != -1]['cluster_id'].nunique()
+    n = len(df)
+    pair_labels = np.asarray(duplicate_pairs).reshape(-1, 2)
+    pos1 = df.index.get_indexer(pair_labels[:, 0])
+    pos2 = df.index.get_indexer(pair_labels[:, 1])
+
+    # Build clusters: connected components of the match graph, computed by
+    # scipy's compiled csgraph routine instead of per-edge Python calls
+    match_graph = coo_matrix(
+        (np.ones(len(pos1), dtype=bool), (pos1, pos2)),
+        shape=(n, n)
+    ).tocsr()
+    _, component_labels = connected_components(match_graph, directed=False)
+
+    # Assign cluster IDs; rows in no pair are singletons
+    paired = np.zeros(n, dtype=bool)
+    paired[pos1] = True
+    paired[pos2] = True
+    df['cluster_id'] = np.where(paired, component_labels, -1)
+
+    # Count clusters and duplicates from the arrays already in hand
+    duplicate_count = int(paired.sum())
+    cluster_count = np.unique(component_labels[paired]).size
 
     logger.info(f"Created {cluster_count} clusters containing {duplicate_count} duplicate records")
 
@@ -242,7 +397,9 @@ def find_duplicates(
     match_fields: List[str] = None,
     blocking_fields: List[str] = None,
     threshold: float = 0.85,
-    max_pairs: int = 50000
+    max_pairs: int = 50000,
+    n_jobs: int = None,
+    batch_size: int = None
 ) -> pd.DataFrame:
     """
     Complete duplicate detection pipeline.
@@ -253,6 +410,8 @@ def find_duplicates(
         blocking_fields: Fields to use for blocking
         threshold: Similarity threshold
         max_pairs: Maximum candidate pairs
+        n_jobs: Scoring threads (-1 = all cores, default: settings.N_JOBS)
+        batch_size: Pairs scored per batch (default: settings.SCORING_BATCH_SIZE)
 
     Returns:
         DataFrame with cluster_id column added
@@ -272,10 +431,12 @@ def find_duplicates(
     logger.info(f"Starting duplicate detection on {len(df)} records")
 
     # Step 1: Generate candidate pairs
-    candidate_pairs = generate_candidate_pairs(df, blocking_fields, max_pairs)
+    candidate_pairs = generate_candidate_pairs(df, blocking_fields, max_pairs, as_array=True)
 
     # Step 2: Calculate similarity scores
-    matches = calculate_similarity_scores(df, candidate_pairs, match_fields, threshold)
+    matches = calculate_similarity_scores(
+        df, candidate_pairs, match_fields, threshold, n_jobs, batch_size
+    )
 
     # Extract pairs without scores
     duplicate_pairs = [(idx1, idx2) for idx1, idx2, score in matches]
@@ -283,9 +444,11 @@ def find_duplicates(
     # Step 3: Cluster duplicates
     df = cluster_duplicates(df, duplicate_pairs)
 
-    # Summary
-    duplicate_count = (df['cluster_id'] != -1).sum()
-    cluster_count = df[df['cluster_id'] != -1]['cluster_id'].nunique()
+    # Summary (one mask over the cluster_id array)
+    cluster_ids = df['cluster_id'].to_numpy()
+    is_dup = cluster_ids != -1
+    duplicate_count = int(is_dup.sum())
+    cluster_count = np.unique(cluster_ids[is_dup]).size
 
     logger.info(f"Duplicate detection complete:")
     logger.info(f"  - {duplicate_count} duplicate records")
@@ -337,9 +500,13 @@ def get_all_clusters(df: pd.DataFrame) -> Dict[int, pd.DataFrame]:
     if 'cluster_id' not in df.columns:
         raise ValueError("DataFrame must have 'cluster_id' column")
 
-    clusters = {}
-    for cluster_id in df[df['cluster_id'] != -1]['cluster_id'].unique():
-        clusters[cluster_id] = get_cluster_records(df, cluster_id)
+    # One grouped pass (clusters in first-appearance order) instead of
+    # re-scanning df for every cluster
+    clustered = df[df['cluster_id'] != -1]
+    clusters = {
+        cluster_id: cluster_records
+        for cluster_id, cluster_records in clustered.groupby('cluster_id', sort=False)
+    }
 
     logger.info(f"Retrieved {len(clusters)} clusters")
 
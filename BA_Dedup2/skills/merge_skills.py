@@ -4,7 +4,8 @@ Extracted from MergeAgent for standalone use.
 """
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from utils.helpers import nonempty_mask
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,6 +15,9 @@ def calculate_completeness_score(record: pd.Series, score_fields: List[str] = No
     """
     Calculate completeness score for a record (higher = more complete).
 
+    Scores a single record; to score every row of a DataFrame use
+    calculate_completeness_scores_df rather than df.apply(..., axis=1).
+
     Args:
         record: Pandas Series representing a record
         score_fields: List of fields to consider for scoring
@@ -29,12 +33,38 @@ def calculate_completeness_score(record: pd.Series, score_fields: List[str] = No
     if score_fields is None:
         score_fields = ['address', 'city', 'state', 'zip', 'phone', 'email', 'contact_person']
 
-    score = sum(
-        1 for field in score_fields
-        if field in record.index and pd.notna(record[field]) and str(record[field]).strip()
-    )
+    values = record.reindex([field for field in score_fields if field in record.index]).to_numpy()
+    filled = pd.notna(values) & (np.array([str(value).strip() for value in values]) != '')
+
+    return int(np.count_nonzero(filled))
+
+
+def calculate_completeness_scores_df(df: pd.DataFrame, score_fields: List[str] = None) -> pd.Series:
+    """
+    Calculate completeness scores for every record in a DataFrame.
+
+    Vectorized equivalent of applying calculate_completeness_score row by row.
+
+    Args:
+        df: Input DataFrame
+        score_fields: List of fields to consider for scoring
+                     Default: ['address', 'city', 'state', 'zip', 'phone', 'email', 'contact_person']
+
+    Returns:
+        Series of completeness scores aligned with df's index
+
+    Example:
+        df['completeness_score'] = calculate_completeness_scores_df(df)
+    """
+    if score_fields is None:
+        score_fields = ['address', 'city', 'state', 'zip', 'phone', 'email', 'contact_person']
+
+    filled_count = np.zeros(len(df), dtype=np.int64)
+    for field in score_fields:
+        if field in df.columns:
+            filled_count += nonempty_mask(df[field])
 
-    return score
+    return pd.Series(filled_count, index=df.index)
 
 
 def select_best_values(cluster_df: pd.DataFrame, value_fields: List[str] = None) -> Dict[str, Any]:
@@ -80,6 +110,46 @@ def select_best_values(cluster_df: pd.DataFrame, value_fields: List[str] = None)
     return best_values
 
 
+def _best_values_by_cluster(clustered: pd.DataFrame, value_fields: List[str] = None) -> pd.DataFrame:
+    """
+    select_best_values for every cluster at once.
+
+    Per field, counts each (cluster_id, value) pair in one groupby and keeps
+    the most frequent value per cluster (smallest value on ties, like mode()).
+    Returns one row per cluster, in first-appearance order, with the value
+    fields followed by cluster_id.
+    """
+    if value_fields is None:
+        value_fields = ['name', 'address', 'city', 'state', 'zip', 'phone', 'email', 'contact_person']
+
+    cluster_ids = clustered['cluster_id']
+    best = pd.DataFrame(index=pd.Index(cluster_ids.unique(), name='cluster_id'))
+
+    for field in value_fields:
+        if field not in clustered.columns:
+            best[field] = ''
+            continue
+
+        # Filter out null/empty values
+        values = clustered[field]
+        keep = nonempty_mask(values)
+        counts = (
+            pd.DataFrame({'cluster_id': cluster_ids[keep], 'value': values[keep]})
+            .groupby(['cluster_id', 'value'])
+            .size()
+            .reset_index(name='count')
+        )
+
+        # Rows are sorted by value within each cluster, so a stable sort on
+        # count keeps the smallest value first among equally common ones
+        counts = counts.sort_values('count', ascending=False, kind='stable')
+        top = counts.drop_duplicates('cluster_id').set_index('cluster_id')['value']
+
+        best[field] = top.reindex(best.index).astype(object).fillna('')
+
+    return best.reset_index()[value_fields + ['cluster_id']]
+
+
 def create_golden_record(
     cluster_df: pd.DataFrame,
     cluster_id: int,
@@ -112,10 +182,10 @@ def create_golden_record(
         golden_record = cluster_df.iloc[0].copy()
 
     elif strategy == 'most_complete':
-        # Select the record with the most complete data
-        cluster_df['_completeness'] = cluster_df.apply(calculate_completeness_score, axis=1)
-        golden_record = cluster_df.loc[cluster_df['_completeness'].idxmax()].copy()
-        golden_record = golden_record.drop('_completeness')
+        # Select the record with the most complete data (scored without
+        # writing a helper column into the caller's slice)
+        completeness = calculate_completeness_scores_df(cluster_df)
+        golden_record = cluster_df.loc[completeness.idxmax()].copy()
 
     elif strategy == 'best_values':
         # Select best value for each field independently
@@ -136,7 +206,8 @@ def merge_cluster(
     cluster_df: pd.DataFrame,
     cluster_id: int,
     strategy: str = 'most_complete',
-    preserve_all_locations: bool = True
+    preserve_all_locations: bool = True,
+    copy_locations: bool = True
 ) -> Tuple[pd.Series, pd.DataFrame]:
     """
     Merge a cluster into a single golden record, optionally preserving all locations.
@@ -146,6 +217,8 @@ def merge_cluster(
         cluster_id: Cluster ID
         strategy: Merging strategy ('most_complete', 'first', 'best_values')
         preserve_all_locations: If True, return all original locations
+        copy_locations: If False, return cluster_df itself as the locations
+                        instead of a copy (for callers that won't modify it)
 
     Returns:
         Tuple of (golden_record: Series, all_locations: DataFrame)
@@ -161,7 +234,7 @@ def merge_cluster(
 
     # Preserve all locations if requested
     if preserve_all_locations:
-        all_locations = cluster_df.copy()
+        all_locations = cluster_df.copy() if copy_locations else cluster_df
     else:
         all_locations = pd.DataFrame()
 
@@ -202,37 +275,37 @@ def merge_all_clusters(
 
     logger.info(f"Merging all clusters in {len(df)} records")
 
-    golden_records = []
-    all_locations_list = []
+    is_clustered = (df['cluster_id'] != -1).to_numpy()
+    clustered = df[is_clustered]
+    singletons = df[~is_clustered]
+    cluster_ids = clustered['cluster_id']
 
-    # Process clusters
-    clustered = df[df['cluster_id'] != -1]
-    for cluster_id in clustered['cluster_id'].unique():
-        cluster_df = df[df['cluster_id'] == cluster_id]
-
-        golden_record, locations = merge_cluster(
-            cluster_df,
-            cluster_id,
-            strategy,
-            preserve_all_locations
-        )
-
-        golden_records.append(golden_record)
-
-        if preserve_all_locations:
-            all_locations_list.append(locations)
-
-    # Add singleton records (not in any cluster)
-    singletons = df[df['cluster_id'] == -1].copy()
-    if len(singletons) > 0:
-        golden_records.extend([row for _, row in singletons.iterrows()])
+    # Build every cluster's golden record in one grouped pass (clusters keep
+    # their first-appearance order) instead of re-scanning df per cluster
+    if strategy == 'first':
+        golden_clusters = clustered.drop_duplicates('cluster_id', keep='first')
+    elif strategy == 'most_complete':
+        completeness = calculate_completeness_scores_df(clustered)
+        golden_clusters = clustered.loc[completeness.groupby(cluster_ids, sort=False).idxmax()]
+    elif strategy == 'best_values':
+        golden_clusters = _best_values_by_cluster(clustered)
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
 
-        if preserve_all_locations:
-            all_locations_list.append(singletons)
+    # Singleton records (not in any cluster) are their own golden records
+    golden_df = pd.concat([golden_clusters, singletons])
 
-    # Convert to DataFrames
-    golden_df = pd.DataFrame(golden_records)
-    all_locations_df = pd.concat(all_locations_list, ignore_index=True) if all_locations_list else pd.DataFrame()
+    if preserve_all_locations:
+        # Cluster members grouped cluster by cluster, then singletons, taken
+        # from df in a single gather
+        cluster_order = np.argsort(pd.factorize(cluster_ids)[0], kind='stable')
+        row_order = np.concatenate([
+            np.flatnonzero(is_clustered)[cluster_order],
+            np.flatnonzero(~is_clustered)
+        ])
+        all_locations_df = df.iloc[row_order].reset_index(drop=True)
+    else:
+        all_locations_df = pd.DataFrame()
 
     logger.info(f"Merge complete:")
     logger.info(f"  - {len(golden_df)} golden records (unique businesses)")
@@ -315,28 +388,26 @@ def get_cluster_summary(df: pd.DataFrame) -> pd.DataFrame:
     if 'cluster_id' not in df.columns:
         raise ValueError("DataFrame must have 'cluster_id' column")
 
-    clustered = df[df['cluster_id'] != -1].copy()
+    clustered = df[df['cluster_id'] != -1]
 
     if len(clustered) == 0:
         return pd.DataFrame()
 
-    summary = clustered.groupby('cluster_id').agg({
-        'cluster_id': 'count',  # Record count
-    }).rename(columns={'cluster_id': 'record_count'})
+    cluster_ids = clustered['cluster_id']
+    summary = cluster_ids.groupby(cluster_ids).size().to_frame('record_count')
 
     # Add completeness statistics
-    clustered['_completeness'] = clustered.apply(calculate_completeness_score, axis=1)
-    completeness_stats = clustered.groupby('cluster_id')['_completeness'].agg(['mean', 'max'])
+    completeness = calculate_completeness_scores_df(clustered)
+    completeness_stats = completeness.groupby(cluster_ids).agg(['mean', 'max'])
     summary['completeness_avg'] = completeness_stats['mean']
     summary['completeness_max'] = completeness_stats['max']
 
-    # Add data availability flags
-    for field in ['phone', 'email', 'address']:
-        if field in clustered.columns:
-            has_field = clustered.groupby('cluster_id')[field].apply(
-                lambda x: x.notna().any()
-            )
-            summary[f'has_{field}'] = has_field
+    # Add data availability flags (one grouped pass over all flag fields)
+    flag_fields = [field for field in ['phone', 'email', 'address'] if field in clustered.columns]
+    if flag_fields:
+        has_fields = clustered[flag_fields].notna().groupby(cluster_ids).any()
+        for field in flag_fields:
+            summary[f'has_{field}'] = has_fields[field]
 
     summary = summary.reset_index()
     summary = summary.sort_values('record_count', ascending=False)
@@ -2,19 +2,115 @@
 Output Skills - Reusable report generation and export functions.
 Extracted from OutputAgent for standalone use.
 """
+import itertools
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from openpyxl import Workbook
+from config import settings
+from utils.helpers import nonempty_mask
 from utils.logger import get_logger
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
+_REPORT_RULE = "=" * 80
+_SECTION_RULE = "-" * 80
+
+# Summary report layout; optional lines and sections are pre-rendered into
+# the locations_line, cluster_section and quality_lines slots
+_SUMMARY_REPORT_TEMPLATE = """\
+{rule}
+DEDUPLICATION SUMMARY REPORT
+{rule}
+Generated: {generated}
+
+INPUT DATA
+{section_rule}
+Total records: {total_records:,}
+Columns: {n_columns}
+
+OUTPUT DATA
+{section_rule}
+Golden records (unique businesses): {golden_records:,}
+{locations_line}Duplicates merged: {duplicates_removed:,}
+Deduplication rate: {dedup_rate:.1f}%
+
+{cluster_section}DATA QUALITY
+{section_rule}
+{quality_lines}
+{rule}"""
+
+_CLUSTER_SECTION_TEMPLATE = """\
+CLUSTER STATISTICS
+{section_rule}
+Number of clusters: {n_clusters:,}
+Records in clusters: {n_in_clusters:,}
+Singleton records: {n_singletons:,}
+
+"""
+
+
+_CSV_ENGINES = ('pandas', 'pyarrow')
+
+
+def _write_csv(frame: pd.DataFrame, output_path: str, engine: str = 'pandas'):
+    """
+    Write a DataFrame to CSV without the index.
+
+    engine='pandas' writes with a chunked, buffered DataFrame.to_csv.
+    engine='pyarrow' uses pyarrow's columnar C++ writer, falling back to
+    pandas if pyarrow is missing or can't convert a column (e.g. mixed
+    Python types in an object column). Its output differs from pandas:
+    - the header and every string value are quoted
+    - booleans are written as true/false instead of True/False
+    - timestamps get a nanosecond fraction (2024-01-01 00:00:00.000000000)
+    - whole-number floats lose their '.0' (a float ZIP 75001.0 -> 75001)
+    - lines always end in '\n' rather than the platform line ending
+    """
+    if engine not in _CSV_ENGINES:
+        raise ValueError(f"Unknown CSV engine {engine!r}, expected one of {_CSV_ENGINES}")
+
+    if engine == 'pyarrow' and not PYARROW_AVAILABLE:
+        logger.debug(f"pyarrow not installed, writing {output_path} with pandas")
+    elif engine == 'pyarrow':
+        try:
+            pa_csv.write_csv(
+                pa.Table.from_pandas(frame, preserve_index=False),
+                output_path,
+                write_options=pa_csv.WriteOptions(batch_size=16384)
+            )
+            return
+        except pa.ArrowException as e:
+            logger.debug(f"pyarrow CSV write failed for {output_path} ({e}), using pandas")
+
+    # Same output as a plain to_csv(path) (platform line endings), through a
+    # 1 MB file buffer and in row chunks so the formatted text stays small
+    with open(output_path, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+        frame.to_csv(f, index=False, chunksize=65536)
+
+
 def export_golden_records(
     golden_df: pd.DataFrame,
     output_path: str = 'output/golden_records.csv',
-    columns: List[str] = None
+    columns: List[str] = None,
+    engine: str = settings.CSV_ENGINE
 ) -> str:
     """
     Export golden records to CSV file.
@@ -23,6 +119,7 @@ def export_golden_records(
         golden_df: DataFrame with golden records
         output_path: Output file path
         columns: Optional list of columns to export (default: all)
+        engine: CSV writer, 'pandas' or 'pyarrow' (default: settings.CSV_ENGINE)
 
     Returns:
         Path to exported file
@@ -32,12 +129,10 @@ def export_golden_records(
     """
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    if columns:
-        export_df = golden_df[columns].copy()
-    else:
-        export_df = golden_df.copy()
+    # The writer only reads, so no defensive copy
+    export_df = golden_df.loc[:, columns] if columns else golden_df
 
-    export_df.to_csv(output_path, index=False)
+    _write_csv(export_df, output_path, engine)
 
     logger.info(f"Exported {len(export_df)} golden records to {output_path}")
 
@@ -47,7 +142,8 @@ def export_golden_records(
 def export_duplicate_report(
     df: pd.DataFrame,
     output_path: str = 'output/duplicate_report.csv',
-    include_score: bool = False
+    include_score: bool = False,
+    engine: str = settings.CSV_ENGINE
 ) -> str:
     """
     Export duplicate report with cluster information.
@@ -56,6 +152,7 @@ def export_duplicate_report(
         df: DataFrame with cluster_id column
         output_path: Output file path
         include_score: Whether to include completeness scores
+        engine: CSV writer, 'pandas' or 'pyarrow' (default: settings.CSV_ENGINE)
 
     Returns:
         Path to exported file
@@ -68,23 +165,68 @@ def export_duplicate_report(
 
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    export_df = df.copy()
+    export_df = _narrow_cluster_ids(df)
 
-    # Add completeness score if requested
+    # Add completeness score if requested (assign returns a new frame, so the
+    # caller's df is left untouched without a separate full copy)
     if include_score:
-        from skills.merge_skills import calculate_completeness_score
-        export_df['completeness_score'] = export_df.apply(calculate_completeness_score, axis=1)
-
-    # Sort by cluster_id
-    export_df = export_df.sort_values('cluster_id')
+        from skills.merge_skills import calculate_completeness_scores_df
+        export_df = export_df.assign(completeness_score=calculate_completeness_scores_df(export_df))
+
+    # Sort by cluster_id, keeping input order within each cluster. Integer ids
+    # are ordered with numpy's stable argsort directly on the array, which is
+    # cheaper than sort_values for small bounded keys
+    cluster_ids = export_df['cluster_id']
+    if pd.api.types.is_integer_dtype(cluster_ids):
+        order = np.argsort(cluster_ids.to_numpy(), kind='stable')
+        export_df = export_df.iloc[order]
+    else:
+        export_df = export_df.sort_values('cluster_id', kind='stable')
 
-    export_df.to_csv(output_path, index=False)
+    _write_csv(export_df, output_path, engine)
 
     logger.info(f"Exported duplicate report to {output_path}")
 
     return output_path
 
 
+def _narrow_cluster_ids(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return frame with an integer cluster_id column narrowed to int32.
+
+    Cluster ids are small, so int32 halves the bytes scanned by the sort and
+    group-by passes in the writers. Non-integer columns (e.g. ids with NaN)
+    and ids outside the int32 range are left as they are.
+    """
+    cluster_ids = frame['cluster_id']
+    if not pd.api.types.is_integer_dtype(cluster_ids) or cluster_ids.dtype == np.int32:
+        return frame
+
+    int32_range = np.iinfo(np.int32)
+    if len(cluster_ids) and (cluster_ids.min() < int32_range.min or cluster_ids.max() > int32_range.max):
+        return frame
+
+    return frame.assign(cluster_id=cluster_ids.astype(np.int32))
+
+
+def _cluster_stats(frame: pd.DataFrame) -> Dict[str, int]:
+    """
+    Cluster counts from one group-by pass over frame's cluster_id values.
+
+    Returns n_clusters (distinct cluster ids), n_in_clusters (records with a
+    cluster id other than -1) and n_singletons (records with -1).
+    """
+    sizes = frame.groupby('cluster_id', sort=False, dropna=False).size()
+    n_singletons = int(sizes.get(-1, 0))
+    real_clusters = (sizes.index != -1) & sizes.index.notna()
+
+    return {
+        'n_clusters': int(real_clusters.sum()),
+        'n_in_clusters': len(frame) - n_singletons,
+        'n_singletons': n_singletons
+    }
+
+
 def generate_statistics(df: pd.DataFrame, clustered_df: pd.DataFrame = None) -> Dict[str, Any]:
     """
     Generate deduplication statistics.
@@ -106,15 +248,16 @@ def generate_statistics(df: pd.DataFrame, clustered_df: pd.DataFrame = None) ->
     }
 
     if clustered_df is not None and 'cluster_id' in clustered_df.columns:
-        duplicate_count = (clustered_df['cluster_id'] != -1).sum()
-        cluster_count = clustered_df[clustered_df['cluster_id'] != -1]['cluster_id'].nunique()
+        cluster_stats = _cluster_stats(clustered_df)
+        duplicate_count = cluster_stats['n_in_clusters']
+        cluster_count = cluster_stats['n_clusters']
         unique_count = len(clustered_df) - duplicate_count + cluster_count
 
         stats.update({
             'duplicate_records': duplicate_count,
             'cluster_count': cluster_count,
             'unique_records': unique_count,
-            'singleton_records': (clustered_df['cluster_id'] == -1).sum(),
+            'singleton_records': cluster_stats['n_singletons'],
             'deduplication_rate': f"{(duplicate_count / len(df) * 100):.1f}%"
         })
 
@@ -125,7 +268,8 @@ def generate_summary_report(
     original_df: pd.DataFrame,
     golden_df: pd.DataFrame,
     all_locations_df: pd.DataFrame = None,
-    output_path: str = 'output/summary_report.txt'
+    output_path: str = 'output/summary_report.txt',
+    echo: bool = True
 ) -> str:
     """
     Generate human-readable summary report.
@@ -135,6 +279,7 @@ def generate_summary_report(
         golden_df: Golden records DataFrame
         all_locations_df: All locations DataFrame (optional)
         output_path: Output file path
+        echo: Whether to also print the report to the console
 
     Returns:
         Path to report file
@@ -144,73 +289,90 @@ def generate_summary_report(
     """
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    report_lines = []
-    report_lines.append("="*80)
-    report_lines.append("DEDUPLICATION SUMMARY REPORT")
-    report_lines.append("="*80)
-    report_lines.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append("")
-
-    # Input statistics
-    report_lines.append("INPUT DATA")
-    report_lines.append("-" * 80)
-    report_lines.append(f"Total records: {len(original_df):,}")
-    report_lines.append(f"Columns: {len(original_df.columns)}")
-    report_lines.append("")
-
-    # Output statistics
-    report_lines.append("OUTPUT DATA")
-    report_lines.append("-" * 80)
-    report_lines.append(f"Golden records (unique businesses): {len(golden_df):,}")
-
-    if all_locations_df is not None:
-        report_lines.append(f"All locations preserved: {len(all_locations_df):,}")
-
     duplicates_removed = len(original_df) - len(golden_df)
     dedup_rate = (duplicates_removed / len(original_df) * 100) if len(original_df) > 0 else 0
 
-    report_lines.append(f"Duplicates merged: {duplicates_removed:,}")
-    report_lines.append(f"Deduplication rate: {dedup_rate:.1f}%")
-    report_lines.append("")
+    locations_line = ''
+    if all_locations_df is not None:
+        locations_line = f"All locations preserved: {len(all_locations_df):,}\n"
 
     # Cluster statistics
+    cluster_section = ''
     if 'cluster_id' in golden_df.columns:
-        clusters = golden_df[golden_df['cluster_id'] != -1]
-        if len(clusters) > 0:
-            report_lines.append("CLUSTER STATISTICS")
-            report_lines.append("-" * 80)
-            report_lines.append(f"Number of clusters: {clusters['cluster_id'].nunique():,}")
-            report_lines.append(f"Records in clusters: {len(clusters):,}")
-            report_lines.append(f"Singleton records: {(golden_df['cluster_id'] == -1).sum():,}")
-            report_lines.append("")
+        cluster_stats = _cluster_stats(_narrow_cluster_ids(golden_df))
+        if cluster_stats['n_in_clusters'] > 0:
+            cluster_section = _CLUSTER_SECTION_TEMPLATE.format(section_rule=_SECTION_RULE, **cluster_stats)
 
     # Data quality
-    report_lines.append("DATA QUALITY")
-    report_lines.append("-" * 80)
-
+    quality_lines = ''
     for field in ['address', 'phone', 'email']:
         if field in golden_df.columns:
-            non_null = golden_df[field].notna() & (golden_df[field].astype(str).str.strip() != '')
-            pct = (non_null.sum() / len(golden_df) * 100) if len(golden_df) > 0 else 0
-            report_lines.append(f"Records with {field}: {non_null.sum():,} ({pct:.1f}%)")
-
-    report_lines.append("")
-    report_lines.append("="*80)
+            filled_count = int(nonempty_mask(golden_df[field]).sum())
+            pct = (filled_count / len(golden_df) * 100) if len(golden_df) > 0 else 0
+            quality_lines += f"Records with {field}: {filled_count:,} ({pct:.1f}%)\n"
+
+    report_text = _SUMMARY_REPORT_TEMPLATE.format(
+        rule=_REPORT_RULE,
+        section_rule=_SECTION_RULE,
+        generated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        total_records=len(original_df),
+        n_columns=len(original_df.columns),
+        golden_records=len(golden_df),
+        locations_line=locations_line,
+        duplicates_removed=duplicates_removed,
+        dedup_rate=dedup_rate,
+        cluster_section=cluster_section,
+        quality_lines=quality_lines
+    )
 
     # Write report
-    report_text = "\n".join(report_lines)
-
-    with open(output_path, 'w') as f:
+    with open(output_path, 'w', buffering=1 << 20) as f:
         f.write(report_text)
 
     logger.info(f"Generated summary report: {output_path}")
 
     # Also log to console
-    print("\n" + report_text)
+    if echo:
+        print("\n" + report_text)
 
     return output_path
 
 
+def _new_workbook(output_path: str):
+    """
+    Open a streaming workbook, preferring xlsxwriter when it is installed.
+
+    xlsxwriter in constant_memory mode flushes each row to disk as it is
+    written; openpyxl's write-only mode is the fallback.
+    """
+    if XLSXWRITER_AVAILABLE:
+        return xlsxwriter.Workbook(output_path, {
+            'constant_memory': True,
+            'strings_to_formulas': False,
+            'strings_to_urls': False
+        })
+    return Workbook(write_only=True)
+
+
+def _new_sheet(workbook, name: str):
+    """Add a sheet to a workbook from _new_workbook and return its row appender."""
+    if XLSXWRITER_AVAILABLE:
+        worksheet = workbook.add_worksheet(name)
+        row_numbers = itertools.count()
+        return lambda row: worksheet.write_row(next(row_numbers), 0, row)
+    return workbook.create_sheet(name).append
+
+
+def _append_frame(append_row, frame: pd.DataFrame):
+    """Stream a DataFrame (header + rows, no index) through a sheet's row appender."""
+    append_row([str(column) for column in frame.columns])
+
+    # Missing values become empty cells, as with DataFrame.to_excel
+    values = frame.astype(object).where(frame.notna(), None)
+    for row in values.itertuples(index=False, name=None):
+        append_row(row)
+
+
 def create_excel_report(
     golden_df: pd.DataFrame,
     all_locations_df: pd.DataFrame = None,
@@ -237,39 +399,39 @@ def create_excel_report(
     """
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
 
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        # Sheet 1: Golden Records
-        golden_df.to_excel(writer, sheet_name='Golden Records', index=False)
+    # Streaming workbook: rows go straight to the sheet XML, in order,
+    # without building a styled Cell object per value
+    workbook = _new_workbook(output_path)
 
-        # Sheet 2: All Locations (if provided)
-        if all_locations_df is not None:
-            all_locations_df.to_excel(writer, sheet_name='All Locations', index=False)
-
-        # Sheet 3: Cluster Summary (if provided)
-        if cluster_summary_df is not None:
-            cluster_summary_df.to_excel(writer, sheet_name='Cluster Summary', index=False)
-
-        # Sheet 4: Statistics
-        stats_data = {
-            'Metric': [
-                'Total Golden Records',
-                'Total Locations',
-                'Number of Clusters',
-                'Records with Address',
-                'Records with Phone',
-                'Records with Email'
-            ],
-            'Value': [
-                len(golden_df),
-                len(all_locations_df) if all_locations_df is not None else 0,
-                golden_df[golden_df['cluster_id'] != -1]['cluster_id'].nunique() if 'cluster_id' in golden_df.columns else 0,
-                (golden_df['address'].notna() & (golden_df['address'].astype(str).str.strip() != '')).sum() if 'address' in golden_df.columns else 0,
-                (golden_df['phone'].notna() & (golden_df['phone'].astype(str).str.strip() != '')).sum() if 'phone' in golden_df.columns else 0,
-                (golden_df['email'].notna() & (golden_df['email'].astype(str).str.strip() != '')).sum() if 'email' in golden_df.columns else 0,
-            ]
-        }
-        stats_df = pd.DataFrame(stats_data)
-        stats_df.to_excel(writer, sheet_name='Statistics', index=False)
+    # Sheet 1: Golden Records
+    _append_frame(_new_sheet(workbook, 'Golden Records'), golden_df)
+
+    # Sheet 2: All Locations (if provided)
+    if all_locations_df is not None:
+        _append_frame(_new_sheet(workbook, 'All Locations'), all_locations_df)
+
+    # Sheet 3: Cluster Summary (if provided)
+    if cluster_summary_df is not None:
+        _append_frame(_new_sheet(workbook, 'Cluster Summary'), cluster_summary_df)
+
+    # Sheet 4: Statistics
+    stats_rows = [
+        ('Total Golden Records', len(golden_df)),
+        ('Total Locations', len(all_locations_df) if all_locations_df is not None else 0),
+        ('Number of Clusters', _cluster_stats(golden_df)['n_clusters'] if 'cluster_id' in golden_df.columns else 0),
+        ('Records with Address', nonempty_mask(golden_df['address']).sum() if 'address' in golden_df.columns else 0),
+        ('Records with Phone', nonempty_mask(golden_df['phone']).sum() if 'phone' in golden_df.columns else 0),
+        ('Records with Email', nonempty_mask(golden_df['email']).sum() if 'email' in golden_df.columns else 0),
+    ]
+    append_stat = _new_sheet(workbook, 'Statistics')
+    append_stat(['Metric', 'Value'])
+    for metric, value in stats_rows:
+        append_stat([metric, int(value)])
+
+    if XLSXWRITER_AVAILABLE:
+        workbook.close()
+    else:
+        workbook.save(output_path)
 
     logger.info(f"Created Excel report: {output_path}")
 
@@ -280,7 +442,8 @@ def export_all(
     original_df: pd.DataFrame,
     golden_df: pd.DataFrame,
     all_locations_df: pd.DataFrame = None,
-    output_dir: str = 'output'
+    output_dir: str = 'output',
+    engine: str = settings.CSV_ENGINE
 ) -> Dict[str, str]:
     """
     Export all output files (CSV, Excel, reports).
@@ -290,6 +453,7 @@ def export_all(
         golden_df: Golden records DataFrame
         all_locations_df: All locations DataFrame (optional)
         output_dir: Output directory
+        engine: CSV writer, 'pandas' or 'pyarrow' (default: settings.CSV_ENGINE)
 
     Returns:
         Dictionary mapping file type to file path
@@ -304,49 +468,63 @@ def export_all(
 
     logger.info(f"Exporting all outputs to {output_dir}")
 
-    files = {}
+    # The CSV and Excel writers spend most of their time in file I/O and C
+    # extensions, so run them side by side on a small thread pool
+    from skills.merge_skills import get_cluster_summary
 
-    # Export golden records CSV
-    files['golden_csv'] = export_golden_records(
-        golden_df,
-        output_path=str(output_dir_path / 'golden_records.csv')
-    )
+    cluster_summary = None
+    if 'cluster_id' in golden_df.columns:
+        cluster_summary = get_cluster_summary(golden_df)
 
-    # Export all locations CSV (if provided)
-    if all_locations_df is not None:
-        files['locations_csv'] = export_golden_records(
-            all_locations_df,
-            output_path=str(output_dir_path / 'all_locations.csv')
-        )
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {}
 
-    # Export duplicate report (if cluster_id present)
-    if 'cluster_id' in golden_df.columns:
-        files['duplicate_report'] = export_duplicate_report(
+        # Export golden records CSV
+        futures['golden_csv'] = executor.submit(
+            export_golden_records,
             golden_df,
-            output_path=str(output_dir_path / 'duplicate_report.csv')
+            output_path=str(output_dir_path / 'golden_records.csv'),
+            engine=engine
         )
 
-    # Generate summary report
-    files['summary_report'] = generate_summary_report(
-        original_df,
-        golden_df,
-        all_locations_df,
-        output_path=str(output_dir_path / 'summary_report.txt')
-    )
+        # Export all locations CSV (if provided)
+        if all_locations_df is not None:
+            futures['locations_csv'] = executor.submit(
+                export_golden_records,
+                all_locations_df,
+                output_path=str(output_dir_path / 'all_locations.csv'),
+                engine=engine
+            )
+
+        # Export duplicate report (if cluster_id present)
+        if 'cluster_id' in golden_df.columns:
+            futures['duplicate_report'] = executor.submit(
+                export_duplicate_report,
+                golden_df,
+                output_path=str(output_dir_path / 'duplicate_report.csv'),
+                engine=engine
+            )
+
+        # Create Excel report
+        futures['excel'] = executor.submit(
+            create_excel_report,
+            golden_df,
+            all_locations_df,
+            cluster_summary,
+            output_path=str(output_dir_path / 'deduplication_report.xlsx')
+        )
 
-    # Create Excel report
-    from skills.merge_skills import get_cluster_summary
+        # Generate summary report (on this thread; it also prints to console)
+        summary_report = generate_summary_report(
+            original_df,
+            golden_df,
+            all_locations_df,
+            output_path=str(output_dir_path / 'summary_report.txt')
+        )
 
-    cluster_summary = None
-    if 'cluster_id' in golden_df.columns:
-        cluster_summary = get_cluster_summary(golden_df)
+        files = {file_type: future.result() for file_type, future in futures.items()}
 
-    files['excel'] = create_excel_report(
-        golden_df,
-        all_locations_df,
-        cluster_summary,
-        output_path=str(output_dir_path / 'deduplication_report.xlsx')
-    )
+    files['summary_report'] = summary_report
 
     logger.info(f"Exported {len(files)} output files")
 
@@ -377,10 +555,10 @@ def print_statistics(df: pd.DataFrame, golden_df: pd.DataFrame = None):
         print(f"Duplicates merged: {duplicates_removed:,} ({dedup_rate:.1f}%)")
 
         if 'cluster_id' in golden_df.columns:
-            clusters = golden_df[golden_df['cluster_id'] != -1]
-            if len(clusters) > 0:
-                print(f"\nClusters: {clusters['cluster_id'].nunique():,}")
-                print(f"Records in clusters: {len(clusters):,}")
-                print(f"Singleton records: {(golden_df['cluster_id'] == -1).sum():,}")
+            cluster_stats = _cluster_stats(golden_df)
+            if cluster_stats['n_in_clusters'] > 0:
+                print(f"\nClusters: {cluster_stats['n_clusters']:,}")
+                print(f"Records in clusters: {cluster_stats['n_in_clusters']:,}")
+                print(f"Singleton records: {cluster_stats['n_singletons']:,}")
 
     print("="*80 + "\n")
@@ -13,7 +13,8 @@ from utils.helpers import (
     normalize_zip,
     remove_title,
     parse_name,
-    extract_entity_type
+    extract_entity_type,
+    nonempty_mask
 )
 from utils.security import tokenize_pii_fields
 
@@ -52,7 +53,7 @@ def check_required_fields(
 
     # Check for records with missing required values
     for field in required_fields:
-        null_mask = df[field].isna() | (df[field].astype(str).str.strip() == '')
+        null_mask = ~nonempty_mask(df[field])
         null_count = null_mask.sum()
 
         if null_count > 0:
@@ -89,6 +90,66 @@ def add_optional_fields(df: pd.DataFrame, optional_fields: Dict[str, any]) -> pd
     return df
 
 
+def _name_columns(name_column: str) -> List[str]:
+    """Columns produced by standardize_name, in _standardize_name_value order."""
+    return [
+        f'{name_column}_no_title',
+        f'{name_column}_title',
+        f'{name_column}_normalized',
+        f'{name_column}_first',
+        f'{name_column}_middle',
+        f'{name_column}_last',
+        f'{name_column}_suffix',
+        'entity_type'
+    ]
+
+
+def _standardize_name_value(name) -> tuple:
+    """All standardize_name outputs for one raw name value."""
+    # Remove titles (Dr, Mr, Mrs, etc.) - one call yields both parts
+    no_title, title = remove_title(name) if pd.notna(name) else ('', '')
+
+    # Parse name components
+    parsed = parse_name(name)
+    if not isinstance(parsed, dict):
+        parsed = {}
+
+    return (
+        no_title,
+        title,
+        normalize_string(no_title, lowercase=False),
+        parsed.get('first', ''),
+        parsed.get('middle', ''),
+        parsed.get('last', ''),
+        parsed.get('suffix', ''),
+        extract_entity_type(name)
+    )
+
+
+def _map_distinct(function, values) -> list:
+    """
+    Apply function once per distinct value and map the results back to every row.
+
+    Values are keyed by (type, value) so that e.g. 75001 and 75001.0, which
+    hash alike but stringify differently, are still standardized separately.
+    """
+    results = {}
+    mapped = []
+    for value in values:
+        key = (value.__class__, value)
+        if key not in results:
+            results[key] = function(value)
+        mapped.append(results[key])
+    return mapped
+
+
+def _assign_columns(df: pd.DataFrame, columns: List[str], rows: List[tuple]):
+    """Write per-row tuples into df as one new column per tuple position."""
+    values = list(zip(*rows)) if rows else [() for _ in columns]
+    for column, column_values in zip(columns, values):
+        df[column] = list(column_values)
+
+
 def standardize_name(df: pd.DataFrame, name_column: str = 'name') -> pd.DataFrame:
     """
     Standardize name field - remove titles, normalize, parse components.
@@ -115,36 +176,8 @@ def standardize_name(df: pd.DataFrame, name_column: str = 'name') -> pd.DataFram
 
     logger.info(f"Standardizing name field: {name_column}")
 
-    # Remove titles (Dr, Mr, Mrs, etc.)
-    df[f'{name_column}_no_title'] = df[name_column].apply(
-        lambda x: remove_title(x)[0] if pd.notna(x) else ''
-    )
-    df[f'{name_column}_title'] = df[name_column].apply(
-        lambda x: remove_title(x)[1] if pd.notna(x) else ''
-    )
-
-    # Normalize name (without title)
-    df[f'{name_column}_normalized'] = df[f'{name_column}_no_title'].apply(
-        lambda x: normalize_string(x, lowercase=False)
-    )
-
-    # Parse name components
-    parsed_names = df[name_column].apply(parse_name)
-    df[f'{name_column}_first'] = parsed_names.apply(
-        lambda x: x.get('first', '') if isinstance(x, dict) else ''
-    )
-    df[f'{name_column}_middle'] = parsed_names.apply(
-        lambda x: x.get('middle', '') if isinstance(x, dict) else ''
-    )
-    df[f'{name_column}_last'] = parsed_names.apply(
-        lambda x: x.get('last', '') if isinstance(x, dict) else ''
-    )
-    df[f'{name_column}_suffix'] = parsed_names.apply(
-        lambda x: x.get('suffix', '') if isinstance(x, dict) else ''
-    )
-
-    # Identify entity type
-    df['entity_type'] = df[name_column].apply(extract_entity_type)
+    names = df[name_column].to_numpy(dtype=object)
+    _assign_columns(df, _name_columns(name_column), _map_distinct(_standardize_name_value, names))
 
     logger.debug(f"Created {7} name-related columns")
 
@@ -171,7 +204,7 @@ def standardize_address(df: pd.DataFrame, address_column: str = 'address') -> pd
         return df
 
     logger.info(f"Standardizing address field: {address_column}")
-    df[f'{address_column}_normalized'] = df[address_column].apply(normalize_address)
+    df[f'{address_column}_normalized'] = _map_distinct(normalize_address, df[address_column].to_numpy(dtype=object))
 
     return df
 
@@ -196,7 +229,7 @@ def standardize_phone(df: pd.DataFrame, phone_column: str = 'phone') -> pd.DataF
         return df
 
     logger.info(f"Standardizing phone field: {phone_column}")
-    df[f'{phone_column}_normalized'] = df[phone_column].apply(normalize_phone)
+    df[f'{phone_column}_normalized'] = _map_distinct(normalize_phone, df[phone_column].to_numpy(dtype=object))
 
     return df
 
@@ -221,7 +254,7 @@ def standardize_zip(df: pd.DataFrame, zip_column: str = 'zip') -> pd.DataFrame:
         return df
 
     logger.info(f"Standardizing ZIP field: {zip_column}")
-    df[f'{zip_column}_normalized'] = df[zip_column].apply(normalize_zip)
+    df[f'{zip_column}_normalized'] = _map_distinct(normalize_zip, df[zip_column].to_numpy(dtype=object))
 
     return df
 
@@ -246,13 +279,71 @@ def standardize_email(df: pd.DataFrame, email_column: str = 'email') -> pd.DataF
         return df
 
     logger.info(f"Standardizing email field: {email_column}")
-    df[email_column] = df[email_column].apply(
-        lambda x: str(x).strip().lower() if pd.notna(x) and '@' in str(x) else ''
-    )
+    # Column-wide string ops instead of a per-cell lambda; values without an
+    # '@' (including missing ones) become ''
+    emails = df[email_column].astype('string')
+    has_at = emails.str.contains('@', regex=False, na=False)
+    df[email_column] = emails.str.strip().str.lower().where(has_at, '').to_numpy(dtype=object)
 
     return df
 
 
+def standardize_all_fields(
+    df: pd.DataFrame,
+    name_column: str = 'name',
+    address_column: str = 'address',
+    phone_column: str = 'phone',
+    zip_column: str = 'zip',
+    email_column: str = 'email'
+) -> pd.DataFrame:
+    """
+    Standardize name, address, phone, ZIP and email in one call.
+
+    Produces the same columns as calling standardize_name, standardize_address,
+    standardize_phone, standardize_zip and standardize_email in turn. Each
+    field's outputs are computed once per distinct value and written as whole
+    columns, rather than once per derived column.
+
+    Args:
+        df: Input DataFrame
+        name_column, address_column, phone_column, zip_column, email_column:
+            Source columns (missing ones are skipped with a warning)
+
+    Returns:
+        DataFrame with all standardized columns added
+
+    Example:
+        df = standardize_all_fields(df)
+        # Creates: name_normalized, address_normalized, phone_normalized, zip_normalized, ...
+    """
+    # (source column, output columns, per-value function)
+    fields = [
+        (name_column, _name_columns(name_column), _standardize_name_value),
+        (address_column, [f'{address_column}_normalized'], lambda x: (normalize_address(x),)),
+        (phone_column, [f'{phone_column}_normalized'], lambda x: (normalize_phone(x),)),
+        (zip_column, [f'{zip_column}_normalized'], lambda x: (normalize_zip(x),)),
+    ]
+
+    present_fields = []
+    for column, output_columns, standardize_value in fields:
+        if column not in df.columns:
+            logger.warning(f"Column '{column}' not found, skipping {column} standardization")
+            continue
+        present_fields.append((column, output_columns, standardize_value))
+
+    if present_fields:
+        logger.info(f"Standardizing fields: {[column for column, _, _ in present_fields]}")
+
+        # Each value yields one tuple of outputs for its field; repeated
+        # values (shared addresses, ZIPs, blanks) reuse the first result
+        for column, output_columns, standardize_value in present_fields:
+            values = df[column].to_numpy(dtype=object)
+            _assign_columns(df, output_columns, _map_distinct(standardize_value, values))
+
+    # Email is already standardized with column-wide string ops
+    return standardize_email(df, email_column)
+
+
 def parse_name_components(df: pd.DataFrame, name_column: str = 'name') -> pd.DataFrame:
     """
     Parse name into components (first, middle, last, suffix).
@@ -271,6 +362,18 @@ def parse_name_components(df: pd.DataFrame, name_column: str = 'name') -> pd.Dat
     return standardize_name(df, name_column)
 
 
+def _count_short_values(values: pd.Series, min_length: int) -> int:
+    """
+    Count present values shorter than min_length characters.
+
+    Missing and blank/whitespace-only values don't count. Values are compared
+    as text, so caller-built numeric columns work too.
+    """
+    text = values.astype(str)
+    present = values.notna() & (text.str.strip() != '')
+    return int((present & (text.str.len() < min_length)).sum())
+
+
 def validate_data_quality(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
     """
     Validate data quality and flag suspicious records.
@@ -289,42 +392,44 @@ def validate_data_quality(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
     """
     validation_errors = []
 
-    # Check for suspiciously short names
+    # Check for suspiciously short names (missing values are not flagged)
     if 'name' in df.columns:
-        short_names = df['name'].astype(str).str.len() < 3
-        if short_names.any():
-            validation_errors.append(f"{short_names.sum()} records with very short names")
+        names = df['name'].to_numpy(dtype=object)
+        short_names = sum(1 for name in names[~pd.isna(names)] if len(str(name)) < 3)
+        if short_names:
+            validation_errors.append(f"{short_names} records with very short names")
 
     # Check for invalid email formats
     if 'email' in df.columns:
-        has_email = df['email'].notna() & (df['email'].astype(str).str.strip() != '')
-        invalid_email = has_email & ~df['email'].astype(str).str.contains('@', na=False)
-        if invalid_email.any():
-            validation_errors.append(f"{invalid_email.sum()} records with invalid email format")
+        emails = df['email'].to_numpy(dtype=object)
+        invalid_email = sum(1 for email in emails[nonempty_mask(emails)] if '@' not in str(email))
+        if invalid_email:
+            validation_errors.append(f"{invalid_email} records with invalid email format")
 
     # Check for invalid ZIP codes
     if 'zip_normalized' in df.columns:
-        has_zip = df['zip_normalized'].notna() & (df['zip_normalized'].astype(str).str.strip() != '')
-        invalid_zip = has_zip & (df['zip_normalized'].astype(str).str.len() < 5)
-        if invalid_zip.any():
-            validation_errors.append(f"{invalid_zip.sum()} records with invalid ZIP code")
+        invalid_zip = _count_short_values(df['zip_normalized'], 5)
+        if invalid_zip:
+            validation_errors.append(f"{invalid_zip} records with invalid ZIP code")
 
     # Check for invalid phone numbers
     if 'phone_normalized' in df.columns:
-        has_phone = df['phone_normalized'].notna() & (df['phone_normalized'].astype(str).str.strip() != '')
-        invalid_phone = has_phone & (df['phone_normalized'].astype(str).str.len() < 10)
-        if invalid_phone.any():
-            validation_errors.append(f"{invalid_phone.sum()} records with invalid phone number")
+        invalid_phone = _count_short_values(df['phone_normalized'], 10)
+        if invalid_phone:
+            validation_errors.append(f"{invalid_phone} records with invalid phone number")
 
     return df, validation_errors
 
 
-def remove_exact_duplicates(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+def remove_exact_duplicates(df: pd.DataFrame, subset: List[str] = None) -> Tuple[pd.DataFrame, int]:
     """
     Remove exact duplicate records.
 
     Args:
         df: Input DataFrame
+        subset: Only compare these columns (default: all columns). Hashing a
+                few normalized columns is much cheaper than every column of a
+                wide frame, but rows that differ elsewhere are then dropped too.
 
     Returns:
         Tuple of (DataFrame without duplicates, number of duplicates removed)
@@ -332,9 +437,12 @@ def remove_exact_duplicates(df: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
     Example:
         df, removed_count = remove_exact_duplicates(df)
         print(f"Removed {removed_count} exact duplicates")
+
+        # Compare normalized keys only
+        df, removed_count = remove_exact_duplicates(df, subset=['name_normalized', 'address_normalized'])
     """
     initial_count = len(df)
-    df = df.drop_duplicates()
+    df = df.drop_duplicates(subset=subset, keep='first')
     removed_count = initial_count - len(df)
 
     if removed_count > 0:
@@ -348,7 +456,8 @@ def validate_all(
     required_fields: List[str],
     optional_fields: Dict[str, any] = None,
     drop_invalid: bool = False,
-    standardize_all: bool = True
+    standardize_all: bool = True,
+    duplicate_subset: List[str] = None
 ) -> Tuple[pd.DataFrame, List[str]]:
     """
     Comprehensive validation and standardization pipeline.
@@ -359,6 +468,8 @@ def validate_all(
         optional_fields: Optional fields with default values
         drop_invalid: Whether to drop invalid records
         standardize_all: Whether to standardize all fields
+        duplicate_subset: Columns compared when removing exact duplicates
+                          (default: all columns), e.g. the normalized fields
 
     Returns:
         Tuple of (validated DataFrame, list of validation errors/warnings)
@@ -386,11 +497,7 @@ def validate_all(
 
     # Standardize all fields if requested
     if standardize_all:
-        df = standardize_name(df)
-        df = standardize_address(df)
-        df = standardize_phone(df)
-        df = standardize_zip(df)
-        df = standardize_email(df)
+        df = standardize_all_fields(df)
 
         # Tokenize PII fields
         df = tokenize_pii_fields(df)
@@ -400,7 +507,8 @@ def validate_all(
     all_errors.extend(quality_errors)
 
     # Remove exact duplicates
-    df, duplicates_removed = remove_exact_duplicates(df)
+    subset = [field for field in duplicate_subset if field in df.columns] if duplicate_subset else None
+    df, duplicates_removed = remove_exact_duplicates(df, subset=subset or None)
     if duplicates_removed > 0:
         all_errors.append(f"Removed {duplicates_removed} exact duplicate records")
 
@@ -2,133 +2,218 @@
 Smart name parsing and deduplication.
 Handles "Last, First" person names while preserving "Company, LLC" business names.
 """
-import pandas as pd
+import itertools
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-print('='*80)
-print('RE-RUNNING WITH IMPROVED NAME PARSING')
-print('='*80)
+import pandas as pd
+
+from config import settings
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Company legal entity suffixes (don't reformat these)
+ENTITY_SUFFIXES = {
+    'LLC', 'L.L.C', 'LP', 'L.P', 'INC', 'CORP', 'LTD',
+    'PLLC', 'PC', 'PA', 'CORPORATION', 'COMPANY', 'CO',
+    'INCORPORATED', 'LIMITED', 'LLP', 'TRUST', 'TR'
+}
+
+# Keywords that mark the part before the comma as a company name
+COMPANY_INDICATORS = re.compile(
+    'PROPERTIES|ASSOCIATES|PARTNERS|GROUP|VENTURES|HOLDINGS|MANAGEMENT|SERVICES|'
+    'ENERGY|OIL|GAS|PETROLEUM|MEDICAL|HEALTH|HOSPITAL|CLINIC|CARE'
+)
+
+# Names with a comma and an entity keyword on either side of it, in one scan
+COMMA_COMPANY_NAME = re.compile(
+    ',.*(?:LLC|LP|INC|CORP|PROPERTIES)|(?:LLC|LP|INC|CORP|PROPERTIES).*,',
+    re.IGNORECASE | re.DOTALL
+)
 
-# Load the data
-df = pd.read_csv('input/sample_data.csv')
-df_dedup = df.drop_duplicates()
+# Rows per input chunk; each chunk is normalized independently
+CHUNK_SIZE = 100_000
 
 # Smart name parser: handles "Last, First" but preserves "Company, LLC"
-def normalize_name(name):
-    if pd.isna(name) or name == '':
-        return name
-
-    name_str = str(name).strip()
-
-    # Company legal entity suffixes (don't reformat these)
-    entity_suffixes = [
-        'LLC', 'L.L.C', 'LP', 'L.P', 'INC', 'CORP', 'LTD',
-        'PLLC', 'PC', 'PA', 'CORPORATION', 'COMPANY', 'CO',
-        'INCORPORATED', 'LIMITED', 'LLP', 'TRUST', 'TR'
-    ]
-
-    # Check if name contains comma
-    if ',' in name_str:
-        parts = name_str.split(',', 1)
-        if len(parts) == 2:
-            first_part = parts[0].strip()
-            second_part = parts[1].strip()
-
-            # Check if second part is a legal entity suffix
-            second_upper = second_part.upper().replace('.', '')
-            if second_upper in entity_suffixes:
-                # This is a company name, keep as-is
-                return name_str
-
-            # Check if first part looks like a company (all caps, contains keywords)
-            company_indicators = ['PROPERTIES', 'ASSOCIATES', 'PARTNERS', 'GROUP',
-                                 'VENTURES', 'HOLDINGS', 'MANAGEMENT', 'SERVICES',
-                                 'ENERGY', 'OIL', 'GAS', 'PETROLEUM', 'MEDICAL',
-                                 'HEALTH', 'HOSPITAL', 'CLINIC', 'CARE']
-
-            first_upper = first_part.upper()
-            if any(indicator in first_upper for indicator in company_indicators):
-                # Likely a company name, keep as-is
-                return name_str
-
-            # Check if first part is all digits (like "123 MAIN ST, LLC")
-            if first_part.replace(' ', '').replace('-', '').isdigit():
-                return name_str
-
-            # Check if first part starts with digits (like "101 ARCH PROPERTIES")
-            if first_part and first_part[0].isdigit():
-                return name_str
-
-            # Otherwise, likely "Last, First" person name
-            # But only if second part looks like a first name (not empty, not just initials)
-            if second_part and len(second_part) > 1:
-                return f'{second_part} {first_part}'
-
-    return name_str
-
-# Apply name normalization
-df_dedup['name_original'] = df_dedup['name']
-df_dedup['name'] = df_dedup['name'].apply(normalize_name)
-
-# Count reformatted
-name_changed = df_dedup['name'] != df_dedup['name_original']
-reformatted = name_changed.sum()
-print(f'\nReformatted {reformatted:,} person names from "Last, First" to "First Last"')
-
-# Show examples
-print('\nExamples of person name reformatting:')
-person_examples = df_dedup[
-    name_changed & df_dedup['name_original'].notna()
-][['name_original', 'name']].head(15)
-
-for idx, row in person_examples.iterrows():
-    print(f'  "{row["name_original"]}" -> "{row["name"]}"')
-
-# Verify company names were NOT reformatted
-print('\nVerifying company names with commas were preserved:')
-has_comma = df_dedup['name_original'].str.contains(',', na=False)
-has_entity = df_dedup['name_original'].str.contains('LLC|LP|INC|CORP|PROPERTIES', case=False, na=False)
-company_check = df_dedup[has_comma & has_entity][['name_original', 'name']].head(10)
-
-if len(company_check) > 0:
-    preserved_count = (company_check['name'] == company_check['name_original']).sum()
-    print(f'Preserved {preserved_count}/{len(company_check)} company names with legal suffixes')
-
-    for idx, row in company_check.iterrows():
-        status = 'OK' if row['name'] == row['name_original'] else 'CHANGED'
-        print(f'  [{status}] "{row["name_original"]}"')
-else:
-    print('No company names with commas found in sample')
-
-# Now deduplicate
-df_dedup['name_normalized'] = df_dedup['name'].str.upper().str.strip()
-
-def completeness_score(row):
-    score = 0
-    for col in ['address', 'city', 'state', 'zip', 'phone', 'email']:
-        if pd.notna(row.get(col)) and row.get(col) != '':
-            score += 1
-    return score
-
-df_dedup['_completeness'] = df_dedup.apply(completeness_score, axis=1)
-
-golden_records = df_dedup.sort_values('_completeness', ascending=False).drop_duplicates('name_normalized', keep='first')
-
-print(f'\n{"="*80}')
-print('DEDUPLICATION RESULTS')
-print('='*80)
-print(f'Unique businesses (with smart name parsing): {len(golden_records):,}')
-print(f'Duplicates merged: {len(df_dedup) - len(golden_records):,}')
-
-# Save
-Path('output').mkdir(exist_ok=True)
-golden_clean = golden_records.drop(columns=['name_normalized', '_completeness', 'name_original'])
-golden_clean.to_csv('output/deduplicated_businesses_final.csv', index=False)
-
-locations = df_dedup[['name_original', 'name', 'address', 'city', 'state', 'zip', 'phone', 'email']].copy()
-locations = locations.sort_values(['name', 'state', 'city'])
-locations.to_csv('output/business_locations_final.csv', index=False)
-
-print(f'\nFiles saved:')
-print(f'  - output/deduplicated_businesses_final.csv ({len(golden_clean):,} businesses)')
-print(f'  - output/business_locations_final.csv ({len(locations):,} locations)')
+def normalize_names(names):
+    """
+    Reformat "Last, First" person names to "First Last" for a whole column.
+
+    Names are stripped; missing and empty names are returned unchanged.
+    A comma name is left as-is when the part after the comma is a legal
+    entity suffix, the part before it contains a company keyword or starts
+    with (or is made of) digits, or the part after it is a single character.
+    """
+    result = names.copy()
+    present = names.notna() & (names != '')
+    name_str = names[present].astype(str).str.strip()
+
+    # Names repeat heavily in dedup input, so parse each distinct name once
+    codes, unique_names = pd.factorize(name_str)
+    reformatted = _reformat_person_names(pd.Series(unique_names, dtype=object))
+    result[present] = reformatted.to_numpy()[codes]
+
+    return result
+
+
+def _reformat_person_names(name_str):
+    """normalize_names' "Last, First" swap over already-stripped name strings."""
+    result = name_str.copy()
+
+    # Only names with a comma can be "Last, First"
+    comma_names = name_str[name_str.str.contains(',', regex=False)]
+    if comma_names.empty:
+        return result
+
+    parts = comma_names.str.split(',', n=1, expand=True)
+    first_part = parts[0].str.strip()
+    second_part = parts[1].str.strip()
+
+    is_entity = second_part.str.upper().str.replace('.', '', regex=False).isin(ENTITY_SUFFIXES)
+    is_company = first_part.str.upper().str.contains(COMPANY_INDICATORS)
+    # Like "123 MAIN ST, LLC" or "101 ARCH PROPERTIES"
+    is_numeric = first_part.str.replace(' ', '', regex=False).str.replace('-', '', regex=False).str.isdigit()
+    starts_with_digit = first_part.str[:1].str.isdigit()
+    # Second part must look like a first name (not empty, not just an initial)
+    has_first_name = second_part.str.len() > 1
+
+    is_person = ~is_entity & ~is_company & ~is_numeric & ~starts_with_digit & has_first_name
+    result[is_person[is_person].index] = second_part[is_person] + ' ' + first_part[is_person]
+
+    return result
+
+
+def normalize_chunk(chunk):
+    """Keep the raw names in name_original and normalize name for one input chunk."""
+    chunk['name_original'] = chunk['name']
+    chunk['name'] = normalize_names(chunk['name'])
+    return chunk
+
+
+def main():
+    print('='*80)
+    print('RE-RUNNING WITH IMPROVED NAME PARSING')
+    print('='*80)
+
+    # Load the data in chunks and normalize names chunk by chunk, so the string
+    # temporaries only ever cover one chunk (state is low-cardinality; ZIPs stay
+    # text so leading zeros survive)
+    reader = pd.read_csv('input/sample_data.csv', dtype={'state': 'category', 'zip': 'string'},
+                         chunksize=CHUNK_SIZE)
+    first_chunks = list(itertools.islice(reader, 2))
+    all_chunks = itertools.chain(first_chunks, reader)
+
+    # Exact duplicates are judged on the raw input columns
+    source_columns = ['name_original' if column == 'name' else column for column in first_chunks[0].columns]
+
+    # Chunks are independent, so spread them over worker processes; a file that
+    # fits in one chunk isn't worth the pool start-up
+    workers = os.cpu_count() if settings.N_JOBS == -1 else settings.N_JOBS
+    if len(first_chunks) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(normalize_chunk, all_chunks))
+    else:
+        chunks = [normalize_chunk(chunk) for chunk in all_chunks]
+
+    df_dedup = pd.concat(chunks)
+    # Chunks carry their own state categories; unify them on the combined frame
+    df_dedup['state'] = df_dedup['state'].astype('category')
+    df_dedup = df_dedup.drop_duplicates(subset=source_columns)
+
+    # Count reformatted
+    name_changed = df_dedup['name'] != df_dedup['name_original']
+    reformatted = name_changed.sum()
+    print(f'\nReformatted {reformatted:,} person names from "Last, First" to "First Last"')
+
+    # Show examples
+    print('\nExamples of person name reformatting:')
+    person_examples = df_dedup[
+        name_changed & df_dedup['name_original'].notna()
+    ][['name_original', 'name']].head(15)
+
+    for name_original, name in person_examples.itertuples(index=False, name=None):
+        print(f'  "{name_original}" -> "{name}"')
+
+    # Verify company names were NOT reformatted
+    print('\nVerifying company names with commas were preserved:')
+    comma_company = df_dedup['name_original'].str.contains(COMMA_COMPANY_NAME, na=False)
+    company_check = df_dedup[comma_company][['name_original', 'name']].head(10)
+
+    if len(company_check) > 0:
+        preserved_count = (company_check['name'] == company_check['name_original']).sum()
+        print(f'Preserved {preserved_count}/{len(company_check)} company names with legal suffixes')
+
+        for name_original, name in company_check.itertuples(index=False, name=None):
+            status = 'OK' if name == name_original else 'CHANGED'
+            print(f'  [{status}] "{name_original}"')
+    else:
+        print('No company names with commas found in sample')
+
+    # Unchanged names equal their original, so only the changed originals are
+    # kept for the locations file; the full copy of the name column is dropped
+    # before the dedup stage
+    changed_originals = df_dedup.loc[name_changed, 'name_original']
+    df_dedup = df_dedup.drop(columns=['name_original'])
+
+    # Now deduplicate
+    df_dedup['name_normalized'] = df_dedup['name'].str.upper().str.strip().astype('category')
+
+    # Completeness = number of filled (non-null, non-empty) contact fields
+    # (one 2-D object array; only non-null cells are compared against '')
+    completeness_values = df_dedup[['address', 'city', 'state', 'zip', 'phone', 'email']].to_numpy(dtype=object)
+    filled = pd.notna(completeness_values)
+    filled[filled] = completeness_values[filled] != ''
+    df_dedup['_completeness'] = filled.sum(axis=1).astype('int8')
+
+    # Most complete record per name (first in file order on ties), picked with a
+    # hash group-by rather than sorting the whole frame; the golden records keep
+    # file order and only they are then ordered by completeness
+    best_rows = df_dedup.groupby('name_normalized', sort=False, observed=True, dropna=False)['_completeness'].idxmax()
+    golden_records = df_dedup[df_dedup.index.isin(best_rows)].sort_values('_completeness', ascending=False, kind='stable')
+
+    print(f'\n{"="*80}')
+    print('DEDUPLICATION RESULTS')
+    print('='*80)
+    print(f'Unique businesses (with smart name parsing): {len(golden_records):,}')
+    print(f'Duplicates merged: {len(df_dedup) - len(golden_records):,}')
+
+    # Save
+    Path('output').mkdir(exist_ok=True)
+    golden_clean = golden_records.drop(columns=['name_normalized', '_completeness'])
+    golden_clean.to_csv('output/deduplicated_businesses_final.csv', index=False)
+
+    name_original = df_dedup['name'].copy()
+    name_original[changed_originals.index] = changed_originals
+    locations = df_dedup[['name', 'address', 'city', 'state', 'zip', 'phone', 'email']].copy()
+    locations.insert(0, 'name_original', name_original)
+    locations = locations.sort_values(['name', 'state', 'city'])
+    locations.to_csv('output/business_locations_final.csv', index=False)
+
+    # Compressed columnar copies for downstream tools; state and ZIP are
+    # categories so Arrow stores them as dictionary pages
+    parquet_saved = False
+    if PYARROW_AVAILABLE:
+        try:
+            for frame, stem in [(golden_clean, 'deduplicated_businesses_final'),
+                                (locations, 'business_locations_final')]:
+                frame.astype({'state': 'category', 'zip': 'category'}).to_parquet(
+                    f'output/{stem}.parquet', compression='zstd', index=False)
+            parquet_saved = True
+        except pa.ArrowException as e:
+            print(f'\nCould not write parquet copies: {e}')
+
+    print(f'\nFiles saved:')
+    print(f'  - output/deduplicated_businesses_final.csv ({len(golden_clean):,} businesses)')
+    print(f'  - output/business_locations_final.csv ({len(locations):,} locations)')
+    if parquet_saved:
+        print('  - Also saved as .parquet (zstd) alongside each CSV')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,20 +2,57 @@
 State management for pipeline execution.
 Tracks progress, enables resume capability, and maintains execution history.
 """
+import atexit
 import json
+import os
+import time
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 from config import settings
 from utils.logger import get_logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+# Live managers, flushed once at interpreter exit; weak so the registry
+# doesn't keep discarded managers alive
+_live_managers = weakref.WeakSet()
+
+
+def _flush_live_managers():
+    """Write any pending state update of every live StateManager."""
+    for manager in list(_live_managers):
+        manager.flush()
+
+
+atexit.register(_flush_live_managers)
+
 
 class StateManager:
     """
     Manages pipeline execution state.
     Tracks completed steps, errors, and allows resuming from last successful step.
+
+    Routine updates are written at most once per settings.STATE_SAVE_INTERVAL;
+    step completions and failures, pipeline completion/failure and resets are
+    written at once. A throttled update is written with the next save, when
+    the manager is garbage collected, or at interpreter exit.
+
+    The state file is indented JSON, or msgpack when its name ends in
+    .msgpack (smaller and faster to rewrite for long pipeline histories).
     """
 
     def __init__(self, state_file: Optional[Path] = None):
@@ -23,18 +60,32 @@ class StateManager:
         Initialize state manager.
 
         Args:
-            state_file: Path to state file. If None, uses settings.STATE_FILE
+            state_file: Path to state file. If None, uses settings.STATE_FILE.
+                        A .msgpack suffix selects the binary format.
         """
-        self.state_file = state_file or settings.STATE_FILE
+        self.state_file = Path(state_file or settings.STATE_FILE)
+        self._use_msgpack = self.state_file.suffix == '.msgpack'
+        if self._use_msgpack and not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed, storing pipeline state as JSON")
+            self.state_file = self.state_file.with_suffix('.json')
+            self._use_msgpack = False
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
         self.state = self._load_state()
+        self._index_steps()
+        self._dirty = False
+        self._last_save = 0.0
+        _live_managers.add(self)
 
     def _load_state(self) -> Dict[str, Any]:
         """Load state from file or create new state."""
         if self.state_file.exists():
             try:
-                with open(self.state_file, 'r') as f:
-                    state = json.load(f)
+                with open(self.state_file, 'rb') as f:
+                    data = f.read()
+                if self._use_msgpack:
+                    state = msgpack.unpackb(data, raw=False, strict_map_key=False)
+                else:
+                    state = json.loads(data)
                 logger.info(f"Loaded pipeline state from {self.state_file}")
                 return state
             except Exception as e:
@@ -42,6 +93,11 @@ class StateManager:
 
         return self._create_initial_state()
 
+    def _index_steps(self):
+        """Rebuild the completed/failed step sets that mirror the state lists."""
+        self._completed_set = set(self.state['completed_steps'])
+        self._failed_set = set(self.state['failed_steps'])
+
     def _create_initial_state(self) -> Dict[str, Any]:
         """Create initial state structure."""
         return {
@@ -58,16 +114,61 @@ class StateManager:
             'metadata': {}
         }
 
-    def _save_state(self):
-        """Save current state to file."""
+    def _serialize_state(self) -> bytes:
+        """Encode state as msgpack or indented JSON (orjson's C encoder when installed)."""
+        if self._use_msgpack:
+            return msgpack.packb(self.state, default=str, use_bin_type=True)
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                self.state,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(self.state, indent=2, default=str).encode('utf-8')
+
+    def _save_state(self, force: bool = False):
+        """
+        Save current state to file.
+
+        Args:
+            force: Write now even if the last write was within STATE_SAVE_INTERVAL
+        """
+        self.state['updated_at'] = datetime.now().isoformat()
+
+        if not force and time.monotonic() - self._last_save < settings.STATE_SAVE_INTERVAL:
+            # Coalesce with later updates; flush() writes it if nothing else does
+            self._dirty = True
+            return
+
         try:
-            self.state['updated_at'] = datetime.now().isoformat()
-            with open(self.state_file, 'w') as f:
-                json.dump(self.state, f, indent=2, default=str)
+            data = self._serialize_state()
+
+            # Write a sibling temp file and rename it over the state file, so
+            # an interrupted write never leaves a truncated state behind
+            tmp_file = self.state_file.with_suffix(self.state_file.suffix + '.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                if settings.STATE_FSYNC:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, self.state_file)
+
+            self._dirty = False
+            self._last_save = time.monotonic()
             logger.debug(f"Saved pipeline state to {self.state_file}")
         except Exception as e:
             logger.error(f"Failed to save state: {e}")
 
+    def flush(self):
+        """Write any state update that is still waiting on the save interval."""
+        if self._dirty:
+            self._save_state(force=True)
+
+    def __del__(self):
+        # getattr: __init__ may have failed before the dirty flag was set
+        if getattr(self, '_dirty', False):
+            self._save_state(force=True)
+
     def start_pipeline(self, pipeline_id: str):
         """Mark pipeline as started."""
         self.state['pipeline_id'] = pipeline_id
@@ -81,7 +182,7 @@ class StateManager:
         self.state['completed_at'] = datetime.now().isoformat()
         self.state['status'] = 'completed'
         self.state['current_step'] = None
-        self._save_state()
+        self._save_state(force=True)
         logger.info("Pipeline completed successfully")
 
     def fail_pipeline(self, error: str):
@@ -92,7 +193,7 @@ class StateManager:
             'error': str(error),
             'step': self.state.get('current_step')
         })
-        self._save_state()
+        self._save_state(force=True)
         logger.error(f"Pipeline failed: {error}")
 
     def start_step(self, step_name: str):
@@ -110,7 +211,8 @@ class StateManager:
 
     def complete_step(self, step_name: str, record_count: Optional[int] = None, metadata: Optional[Dict] = None):
         """Mark a step as completed."""
-        if step_name not in self.state['completed_steps']:
+        if step_name not in self._completed_set:
+            self._completed_set.add(step_name)
             self.state['completed_steps'].append(step_name)
 
         self.state['step_results'][step_name].update({
@@ -120,12 +222,14 @@ class StateManager:
             'metadata': metadata or {}
         })
 
-        self._save_state()
+        # Resume relies on completed steps, so never leave one throttled
+        self._save_state(force=True)
         logger.info(f"Step completed: {step_name}")
 
     def fail_step(self, step_name: str, error: str):
         """Mark a step as failed."""
-        if step_name not in self.state['failed_steps']:
+        if step_name not in self._failed_set:
+            self._failed_set.add(step_name)
             self.state['failed_steps'].append(step_name)
 
         self.state['step_results'][step_name].update({
@@ -140,12 +244,12 @@ class StateManager:
             'error': str(error)
         })
 
-        self._save_state()
+        self._save_state(force=True)
         logger.error(f"Step failed: {step_name} - {error}")
 
     def should_skip_step(self, step_name: str) -> bool:
         """Check if a step should be skipped (already completed)."""
-        return step_name in self.state['completed_steps']
+        return step_name in self._completed_set
 
     def get_last_completed_step(self) -> Optional[str]:
         """Get the name of the last completed step."""
@@ -164,7 +268,8 @@ class StateManager:
     def reset(self):
         """Reset state to initial values."""
         self.state = self._create_initial_state()
-        self._save_state()
+        self._index_steps()
+        self._save_state(force=True)
         logger.info("Pipeline state reset")
 
     def set_metadata(self, key: str, value: Any):
@@ -3,6 +3,7 @@ Quick verification tests for Priority 4 optimizations.
 Tests each optimization component individually.
 """
 import sys
+import tempfile
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -45,6 +46,57 @@ try:
     stats = fuzzy_cache.get_stats()
     print(f"   [OK] FuzzyMatchCache working (hit_rate: {stats['hit_rate']:.1%})")
 
+    # Test disk cache: msgpack-able and pickle-only values round-trip with
+    # their types, survive a reopen, a torn last record and compaction
+    with tempfile.TemporaryDirectory() as cache_dir:
+        disk_cache = DiskCache(cache_dir)
+        values = {
+            'plain': {'name': 'ACME', 'zips': [75001, 75002], 'score': 0.5},
+            'tuple': (32.78, -96.80),
+            'frame': pd.DataFrame({'zip': ['75001', '10001']})
+        }
+        for key, value in values.items():
+            disk_cache.put(value, 'test', key)
+        disk_cache.put('old', 'test', 'replaced')
+        disk_cache.put('new', 'test', 'replaced')
+        disk_cache.put(1, 'other', 'kept')
+
+        def check_round_trip(reader, label):
+            assert reader.get('test', 'plain') == values['plain'], f"Disk cache {label}: msgpack value"
+            assert reader.get('test', 'tuple') == values['tuple'], f"Disk cache {label}: pickled tuple"
+            assert reader.get('test', 'frame').equals(values['frame']), f"Disk cache {label}: pickled DataFrame"
+            assert reader.get('test', 'replaced') == 'new', f"Disk cache {label}: re-put value"
+            assert reader.get('test', 'missing') is None, f"Disk cache {label}: missing key"
+
+        check_round_trip(disk_cache, "round-trip")
+
+        # A new instance rebuilds the index from the log on disk
+        check_round_trip(DiskCache(cache_dir), "reopen")
+
+        # An interrupted append leaves a partial record; the scan drops it
+        log_file = Path(cache_dir) / 'test.log'
+        intact_size = log_file.stat().st_size
+        with open(log_file, 'ab') as f:
+            f.write(DiskCache._RECORD_HEADER.pack(DiskCache._PICKLE, 10, 100) + b'partial')
+        reopened = DiskCache(cache_dir)
+        check_round_trip(reopened, "torn record")
+        assert log_file.stat().st_size == intact_size, "Disk cache torn record not truncated"
+
+        reopened.compact('test')
+        assert log_file.stat().st_size < intact_size, "Disk cache compaction reclaimed nothing"
+        check_round_trip(reopened, "compact")
+        check_round_trip(DiskCache(cache_dir), "reopen after compact")
+
+        reopened.clear('test')
+        assert reopened.get('test', 'plain') is None, "Disk cache clear(namespace) left entries"
+        assert not log_file.exists(), "Disk cache clear(namespace) left the log file"
+        assert reopened.get('other', 'kept') == 1, "Disk cache clear(namespace) removed another namespace"
+
+        # Release the memory maps before the directory is removed
+        reopened.clear()
+        disk_cache.clear()
+    print(f"   [OK] DiskCache working (round-trip, reopen, torn record, compact, clear)")
+
     print(f"   [OK] Cache module: PASSED")
 except Exception as e:
     print(f"   [FAIL] Cache module: FAILED - {e}")
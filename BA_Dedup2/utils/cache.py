@@ -10,12 +10,22 @@ Reduces redundant computations by 50-80% for typical datasets.
 """
 import hashlib
 import functools
+import inspect
+import mmap
+import os
+import struct
 from typing import Any, Callable, Optional, Dict, Tuple
 from collections import OrderedDict
 import pickle
 from pathlib import Path
 from utils.logger import get_logger
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
@@ -55,18 +65,19 @@ class NormalizationCache:
         Returns:
             Normalized value if cached, None otherwise
         """
-        if field_type not in self.caches:
+        cache = self.caches.get(field_type)
+        if cache is None:
             return None
 
-        cache = self.caches[field_type]
-        if value in cache:
-            self.hits += 1
-            # Move to end (LRU)
+        # move_to_end doubles as the membership test (LRU bump in C)
+        try:
             cache.move_to_end(value)
-            return cache[value]
+        except KeyError:
+            self.misses += 1
+            return None
 
-        self.misses += 1
-        return None
+        self.hits += 1
+        return cache[value]
 
     def put(self, field_type: str, value: str, normalized: str):
         """
@@ -77,13 +88,12 @@ class NormalizationCache:
             value: Original value
             normalized: Normalized value
         """
-        if field_type not in self.caches:
+        cache = self.caches.get(field_type)
+        if cache is None:
             return
 
-        cache = self.caches[field_type]
-
-        # Remove oldest if at capacity
-        if len(cache) >= self.max_size:
+        # Remove oldest if at capacity (a re-put of a cached value evicts nothing)
+        if len(cache) >= self.max_size and value not in cache:
             cache.popitem(last=False)
 
         cache[value] = normalized
@@ -128,7 +138,7 @@ class FuzzyMatchCache:
         self.hits = 0
         self.misses = 0
 
-    def _make_key(self, str1: str, str2: str) -> str:
+    def _make_key(self, str1: str, str2: str) -> Tuple[str, str]:
         """
         Create cache key for string pair.
 
@@ -139,11 +149,9 @@ class FuzzyMatchCache:
         Returns:
             Cache key (order-independent)
         """
-        # Sort to make order-independent
-        if str1 > str2:
-            str1, str2 = str2, str1
-        # Use hash for memory efficiency
-        return hashlib.md5(f"{str1}|{str2}".encode()).hexdigest()
+        # The pair itself is the key: the dict hashes the tuple from the
+        # strings' cached hashes, with no formatting, encoding or digest
+        return (str1, str2) if str1 <= str2 else (str2, str1)
 
     def get(self, str1: str, str2: str) -> Optional[float]:
         """
@@ -158,14 +166,15 @@ class FuzzyMatchCache:
         """
         key = self._make_key(str1, str2)
 
-        if key in self.cache:
-            self.hits += 1
-            # Move to end (LRU)
+        # move_to_end doubles as the membership test (LRU bump in C)
+        try:
             self.cache.move_to_end(key)
-            return self.cache[key]
+        except KeyError:
+            self.misses += 1
+            return None
 
-        self.misses += 1
-        return None
+        self.hits += 1
+        return self.cache[key]
 
     def put(self, str1: str, str2: str, score: float):
         """
@@ -178,8 +187,8 @@ class FuzzyMatchCache:
         """
         key = self._make_key(str1, str2)
 
-        # Remove oldest if at capacity
-        if len(self.cache) >= self.max_size:
+        # Remove oldest if at capacity (a re-put of a cached pair evicts nothing)
+        if len(self.cache) >= self.max_size and key not in self.cache:
             self.cache.popitem(last=False)
 
         self.cache[key] = score
@@ -212,8 +221,28 @@ class DiskCache:
     - Pre-computed blocking buckets
     - Geocoding results
     - ML model predictions
+
+    Each namespace is one append-only log file ({namespace}.log) of
+    [header][key][encoded value] records, rather than one file per entry.
+    The key -> (offset, length, format) index is rebuilt by scanning the
+    record headers the first time a namespace is used; a later put for the
+    same key appends a new record that supersedes the old one, so re-puts
+    grow the log until compact() rewrites it with only the live records.
+    Per-entry {namespace}_*.pkl files from older versions are no longer read
+    but are still removed by clear(). Logs are read
+    through a memory map, so values are decoded straight from the page cache
+    without copying the record into a bytes object first.
+
+    Values made only of plain msgpack types (None, bool, int, float, str,
+    bytes, list, dict) are stored as msgpack when it is installed; anything
+    else (tuples, arrays, DataFrames, custom objects) is pickled.
     """
 
+    # Record header: value format, key length, value length
+    _RECORD_HEADER = struct.Struct('<BHQ')
+    _PICKLE = 0
+    _MSGPACK = 1
+
     def __init__(self, cache_dir: str = '.cache'):
         """
         Initialize disk cache.
@@ -223,6 +252,8 @@ class DiskCache:
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._indexes: Dict[str, Dict[str, Tuple[int, int, int]]] = {}
+        self._maps: Dict[str, mmap.mmap] = {}
 
     def _make_key(self, namespace: str, *args, **kwargs) -> str:
         """
@@ -238,9 +269,94 @@ class DiskCache:
         """
         # Serialize args and kwargs
         key_data = pickle.dumps((args, sorted(kwargs.items())))
-        key_hash = hashlib.md5(key_data).hexdigest()
+        key_hash = hashlib.blake2b(key_data, digest_size=16).hexdigest()
         return f"{namespace}_{key_hash}"
 
+    def _log_file(self, namespace: str) -> Path:
+        """Path of the segment log holding a namespace's entries."""
+        return self.cache_dir / f"{namespace}.log"
+
+    def _load_index(self, namespace: str) -> Dict[str, Tuple[int, int, int]]:
+        """
+        Get the in-memory index of a namespace, scanning its log on first use.
+
+        A truncated trailing record (interrupted write) is cut off the log.
+
+        Args:
+            namespace: Cache namespace
+
+        Returns:
+            Dict of cache key -> (value offset, value length, value format)
+        """
+        index = self._indexes.get(namespace)
+        if index is not None:
+            return index
+
+        index = {}
+        log_file = self._log_file(namespace)
+        header = self._RECORD_HEADER
+        end = 0
+        try:
+            with open(log_file, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                while True:
+                    record_header = f.read(header.size)
+                    if len(record_header) < header.size:
+                        break
+                    value_format, key_length, value_length = header.unpack(record_header)
+                    key = f.read(key_length)
+                    offset = end + header.size + key_length
+                    if len(key) < key_length or offset + value_length > file_size:
+                        break
+                    index[key.decode('utf-8')] = (offset, value_length, value_format)
+                    end = offset + value_length
+                    f.seek(end)
+            if end < file_size:
+                logger.warning(f"Dropping incomplete record at the end of {log_file}")
+                os.truncate(log_file, end)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to index cache file {log_file}: {e}")
+
+        self._indexes[namespace] = index
+        return index
+
+    def _encode(self, value: Any) -> Tuple[int, bytes]:
+        """Encode a value as msgpack when it round-trips exactly, else pickle."""
+        if MSGPACK_AVAILABLE:
+            try:
+                # strict_types rejects tuples and subclasses, which msgpack
+                # would hand back as plain lists/base types
+                return self._MSGPACK, msgpack.packb(value, use_bin_type=True, strict_types=True)
+            except (TypeError, ValueError, OverflowError):
+                pass
+        return self._PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _mapped_log(self, namespace: str, end: int) -> mmap.mmap:
+        """
+        Get a read-only map of a namespace's log covering at least end bytes.
+
+        The map is reused across gets and only remapped once appends have
+        grown the log past it.
+        """
+        log_map = self._maps.get(namespace)
+        if log_map is None or len(log_map) < end:
+            if log_map is not None:
+                log_map.close()
+            with open(self._log_file(namespace), 'rb') as f:
+                log_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[namespace] = log_map
+        return log_map
+
+    def _close_maps(self, namespace: Optional[str] = None):
+        """Unmap one namespace's log, or all of them."""
+        namespaces = [namespace] if namespace else list(self._maps)
+        for name in namespaces:
+            log_map = self._maps.pop(name, None)
+            if log_map is not None:
+                log_map.close()
+
     def get(self, namespace: str, *args, **kwargs) -> Optional[Any]:
         """
         Get value from disk cache.
@@ -253,18 +369,25 @@ class DiskCache:
         Returns:
             Cached value if exists, None otherwise
         """
-        key = self._make_key(namespace, *args, **kwargs)
-        cache_file = self.cache_dir / f"{key}.pkl"
+        return self._get(namespace, self._make_key(namespace, *args, **kwargs))
 
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'rb') as f:
-                    return pickle.load(f)
-            except Exception as e:
-                logger.warning(f"Failed to load cache file {cache_file}: {e}")
-                return None
+    def _get(self, namespace: str, key: str) -> Optional[Any]:
+        """get() for an already-built cache key."""
+        entry = self._load_index(namespace).get(key)
+        if entry is None:
+            return None
 
-        return None
+        offset, length, value_format = entry
+        log_file = self._log_file(namespace)
+        try:
+            log_map = self._mapped_log(namespace, offset + length)
+            with memoryview(log_map) as view:
+                if value_format == self._MSGPACK:
+                    return msgpack.unpackb(view[offset:offset + length], raw=False, strict_map_key=False)
+                return pickle.loads(view[offset:offset + length])
+        except Exception as e:
+            logger.warning(f"Failed to load cache entry {key} from {log_file}: {e}")
+            return None
 
     def put(self, value: Any, namespace: str, *args, **kwargs):
         """
@@ -276,14 +399,30 @@ class DiskCache:
             *args: Arguments used to generate cache key
             **kwargs: Keyword arguments used to generate cache key
         """
-        key = self._make_key(namespace, *args, **kwargs)
-        cache_file = self.cache_dir / f"{key}.pkl"
+        self._put(value, namespace, self._make_key(namespace, *args, **kwargs))
+
+    def _put(self, value: Any, namespace: str, key: str):
+        """put() for an already-built cache key."""
+        index = self._load_index(namespace)
+        log_file = self._log_file(namespace)
 
         try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(value, f)
+            value_format, data = self._encode(value)
+            key_bytes = key.encode('utf-8')
+            record = self._RECORD_HEADER.pack(value_format, len(key_bytes), len(data)) + key_bytes + data
+
+            # O_APPEND puts the record at the current end of the log in one
+            # write; the position afterwards locates the value
+            fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, record)
+                end = os.lseek(fd, 0, os.SEEK_CUR)
+            finally:
+                os.close(fd)
+
+            index[key] = (end - len(data), len(data), value_format)
         except Exception as e:
-            logger.warning(f"Failed to write cache file {cache_file}: {e}")
+            logger.warning(f"Failed to write cache entry {key} to {log_file}: {e}")
 
     def clear(self, namespace: Optional[str] = None):
         """
@@ -292,16 +431,65 @@ class DiskCache:
         Args:
             namespace: Optional namespace to clear (clears all if None)
         """
+        # Unmap before unlinking (Windows refuses to delete mapped files)
+        self._close_maps(namespace)
         if namespace:
-            pattern = f"{namespace}_*.pkl"
+            # Also the per-entry .pkl files written by older versions
+            patterns = [f"{namespace}.log", f"{namespace}_*.pkl"]
+            self._indexes.pop(namespace, None)
         else:
-            pattern = "*.pkl"
+            patterns = ["*.log", "*.pkl"]
+            self._indexes.clear()
 
-        for cache_file in self.cache_dir.glob(pattern):
-            try:
-                cache_file.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to delete cache file {cache_file}: {e}")
+        for pattern in patterns:
+            for cache_file in self.cache_dir.glob(pattern):
+                try:
+                    cache_file.unlink()
+                except Exception as e:
+                    logger.warning(f"Failed to delete cache file {cache_file}: {e}")
+
+    def compact(self, namespace: str):
+        """
+        Rewrite a namespace's log with only its live records.
+
+        Records superseded by later puts are dropped. The new log is written
+        beside the old one and swapped in with os.replace, so an interrupted
+        compaction leaves the old log intact.
+
+        Args:
+            namespace: Cache namespace
+        """
+        index = self._load_index(namespace)
+        log_file = self._log_file(namespace)
+        if not index:
+            return
+
+        tmp_file = log_file.with_suffix('.log.tmp')
+        header = self._RECORD_HEADER
+        new_index = {}
+        try:
+            log_map = self._mapped_log(namespace, max(offset + length for offset, length, _ in index.values()))
+            with open(tmp_file, 'wb') as f, memoryview(log_map) as view:
+                position = 0
+                for key, (offset, length, value_format) in index.items():
+                    key_bytes = key.encode('utf-8')
+                    f.write(header.pack(value_format, len(key_bytes), length))
+                    f.write(key_bytes)
+                    f.write(view[offset:offset + length])
+                    position += header.size + len(key_bytes)
+                    new_index[key] = (position, length, value_format)
+                    position += length
+
+            old_size = os.path.getsize(log_file)
+            self._close_maps(namespace)
+            os.replace(tmp_file, log_file)
+        except Exception as e:
+            logger.warning(f"Failed to compact cache file {log_file}: {e}")
+            tmp_file.unlink(missing_ok=True)
+            return
+
+        self._indexes[namespace] = new_index
+        logger.info(f"Compacted {log_file}: {old_size:,} -> {position:,} bytes")
 
 
 # Global cache instances
@@ -390,33 +578,68 @@ def memoize(maxsize: int = 128):
 
 
 # Decorator for disk-cached functions
+# Argument types whose repr is a faithful, unambiguous cache key
+_PLAIN_KEY_TYPES = (str, int, float)
+_MAX_PLAIN_KEY_LENGTH = 256
+
+
+def _has_plain_key_signature(func: Callable) -> bool:
+    """True if every parameter of func is a named str/int/float parameter."""
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return all(
+        parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)
+        and parameter.annotation in _PLAIN_KEY_TYPES
+        for parameter in parameters
+    )
+
+
 def disk_cached(namespace: str):
     """
     Decorator to cache function results to disk.
 
+    Functions whose parameters are all annotated str/int/float get their
+    cache key straight from the argument values (no pickling or hashing)
+    when called positionally with such values; other calls use the
+    general DiskCache key.
+
     Args:
         namespace: Cache namespace
 
     Usage:
         @disk_cached('geocode')
-        def geocode_address(address):
+        def geocode_address(address: str):
             # expensive API call
             return lat, lon
     """
     def decorator(func: Callable) -> Callable:
+        plain_key_signature = _has_plain_key_signature(func)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             cache = get_disk_cache()
 
+            key = None
+            if plain_key_signature and not kwargs and all(type(arg) in _PLAIN_KEY_TYPES for arg in args):
+                # repr of a tuple starts with '(', so these never collide
+                # with the hashed keys
+                key = f"{namespace}_{args!r}"
+                if len(key) > _MAX_PLAIN_KEY_LENGTH:
+                    key = None
+            if key is None:
+                key = cache._make_key(namespace, *args, **kwargs)
+
             # Try to get from cache
-            result = cache.get(namespace, *args, **kwargs)
+            result = cache._get(namespace, key)
             if result is not None:
                 logger.debug(f"Disk cache hit: {func.__name__}")
                 return result
 
             # Compute and cache
             result = func(*args, **kwargs)
-            cache.put(result, namespace, *args, **kwargs)
+            cache._put(result, namespace, key)
             return result
 
         return wrapper
@@ -10,6 +10,7 @@ import re
 import time
 import functools
 from typing import Any, Callable, Optional
+import numpy as np
 import pandas as pd
 from utils.logger import get_logger
 
@@ -597,6 +598,25 @@ def parse_name(full_name: Optional[str]) -> dict:
             }
 
 
+def nonempty_mask(values) -> np.ndarray:
+    """
+    Mask of values that are neither missing nor blank.
+
+    Same test as `notna() & (astype(str).str.strip() != '')`, done in one pass
+    over the object array instead of building two temporary Series.
+
+    Args:
+        values: Series or array of values
+
+    Returns:
+        Boolean ndarray aligned with values
+    """
+    array = np.asarray(values, dtype=object)
+    mask = ~pd.isna(array)
+    mask[mask] = [bool(str(value).strip()) for value in array[mask]]
+    return mask
+
+
 def calculate_completeness_score(record: pd.Series, important_fields: list) -> float:
     """
     Calculate a completeness score for a record based on how many important fields are filled.
@@ -617,6 +637,30 @@ def calculate_completeness_score(record: pd.Series, important_fields: list) -> f
     return filled_count / len(important_fields)
 
 
+def calculate_completeness_scores(records: pd.DataFrame, important_fields: list) -> pd.Series:
+    """
+    Calculate completeness scores for every record in a DataFrame.
+
+    Vectorized equivalent of applying calculate_completeness_score row by row.
+
+    Args:
+        records: DataFrame of records
+        important_fields: List of field names to check
+
+    Returns:
+        Series of completeness scores between 0 and 1, aligned with records
+    """
+    if not important_fields:
+        return pd.Series(0.0, index=records.index)
+
+    filled_count = np.zeros(len(records), dtype=np.int64)
+    for field in important_fields:
+        if field in records.columns:
+            filled_count += nonempty_mask(records[field])
+
+    return pd.Series(filled_count / len(important_fields), index=records.index)
+
+
 def merge_records(records: pd.DataFrame, strategy='most_complete', important_fields=None) -> pd.Series:
     """
     Merge multiple duplicate records into a single golden record.
@@ -640,18 +684,13 @@ def merge_records(records: pd.DataFrame, strategy='most_complete', important_fie
         if important_fields is None:
             important_fields = list(records.columns)
 
-        records['_completeness_score'] = records.apply(
-            lambda row: calculate_completeness_score(row, important_fields),
-            axis=1
-        )
+        completeness = calculate_completeness_scores(records, important_fields)
 
-        # Start with most complete record
-        golden = records.nlargest(1, '_completeness_score', keep='first').iloc[0].copy()
+        # Start with most complete record (first one on ties)
+        golden = records.iloc[completeness.to_numpy().argmax()].copy()
 
         # Fill in missing fields from other records (vectorized)
         for col in records.columns:
-            if col == '_completeness_score':
-                continue
             if pd.isna(golden[col]) or str(golden[col]).strip() == '':
                 # Find first non-null, non-empty value in this column (vectorized)
                 non_empty = records[col][records[col].notna() & (records[col].astype(str).str.strip() != '')]
@@ -680,10 +719,6 @@ def merge_records(records: pd.DataFrame, strategy='most_complete', important_fie
                     best_zip = matching_zips.iloc[0]
                     golden['zip'] = best_zip
 
-        # Remove temporary score field
-        if '_completeness_score' in golden:
-            golden = golden.drop('_completeness_score')
-
         return golden
 
     elif strategy == 'most_recent':
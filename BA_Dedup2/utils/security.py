@@ -6,6 +6,7 @@ import hashlib
 import os
 import re
 from typing import Optional
+import numpy as np
 import pandas as pd
 
 # Salt for hashing - CHANGE THIS IN PRODUCTION!
@@ -36,11 +37,13 @@ def tokenize_ssn(ssn: Optional[str]) -> str:
     if not ssn_norm or len(ssn_norm) != 9:
         return ''
 
-    # Hash with salt
-    salted = f"{ssn_norm}|{SSN_SALT}"
-    hashed = hashlib.sha256(salted.encode()).hexdigest()
+    return _salted_hash(ssn_norm)
 
-    return hashed
+
+def _salted_hash(digits: str) -> str:
+    """Hex-encoded SHA256 of normalized digits joined with the salt."""
+    salted = f"{digits}|{SSN_SALT}"
+    return hashlib.sha256(salted.encode()).hexdigest()
 
 
 def clean_ssn(ssn: Optional[str]) -> str:
@@ -112,11 +115,7 @@ def tokenize_ein(ein: Optional[str]) -> str:
     if len(ein_digits) != 9:
         return ''
 
-    # Hash with salt
-    salted = f"{ein_digits}|{SSN_SALT}"
-    hashed = hashlib.sha256(salted.encode()).hexdigest()
-
-    return hashed
+    return _salted_hash(ein_digits)
 
 
 def mask_ssn(ssn: Optional[str]) -> str:
@@ -156,15 +155,25 @@ def tokenize_pii_fields(df: pd.DataFrame) -> pd.DataFrame:
     """
     df = df.copy()
 
+    # Each distinct value is cleaned and hashed once; rows pick their result
+    # by factorized code. Missing values get code -1, which selects the
+    # trailing empty string appended to each lookup array.
+
     # Tokenize SSN if present
     if 'ssn' in df.columns:
-        df['ssn_token'] = df['ssn'].apply(tokenize_ssn)
-        df['ssn_masked'] = df['ssn'].apply(mask_ssn)
+        codes, uniques = pd.factorize(df['ssn'])
+        cleaned = [clean_ssn(ssn) for ssn in uniques]
+        tokens = np.array([_salted_hash(ssn) if ssn else '' for ssn in cleaned] + [''], dtype=object)
+        masked = np.array([f"XXX-XX-{ssn[-4:]}" if ssn else '' for ssn in cleaned] + [''], dtype=object)
+        df['ssn_token'] = tokens[codes]
+        df['ssn_masked'] = masked[codes]
         # Drop raw SSN for security (optional - uncomment if desired)
         # df = df.drop(columns=['ssn'])
 
     # Tokenize EIN if present
     if 'ein' in df.columns:
-        df['ein_token'] = df['ein'].apply(tokenize_ein)
+        codes, uniques = pd.factorize(df['ein'])
+        tokens = np.array([tokenize_ein(ein) for ein in uniques] + [''], dtype=object)
+        df['ein_token'] = tokens[codes]
 
     return df
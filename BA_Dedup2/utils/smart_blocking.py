@@ -9,12 +9,22 @@ Key improvements:
 - Phonetic blocking for name variations
 - Limited fallback for missing data
 - Configurable max pairs to prevent explosions
+- Optional MinHash LSH name blocking (requires datasketch)
 """
+import numpy as np
 import pandas as pd
 import recordlinkage as rl
+from itertools import chain
 from typing import List, Tuple, Set
+from config import settings
 from utils.logger import get_logger
 
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+
 logger = get_logger(__name__)
 
 
@@ -29,17 +39,30 @@ class SmartBlockingStrategy:
     4. City blocking (for records missing state/ZIP)
     5. Phone prefix blocking (area code + exchange)
     6. Name token blocking (first 3 words)
+    6b. MinHash LSH name blocking (optional, near-duplicate names)
     7. Limited full comparison (last resort, capped at max_pairs)
     """
 
-    def __init__(self, max_missing_data_pairs: int = 50000):
+    def __init__(self, max_missing_data_pairs: int = 50000,
+                 use_minhash_lsh: bool = settings.USE_MINHASH_LSH,
+                 lsh_threshold: float = settings.LSH_THRESHOLD,
+                 lsh_num_perm: int = settings.LSH_NUM_PERM,
+                 max_lsh_pairs: int = settings.LSH_MAX_PAIRS):
         """
         Initialize smart blocking strategy.
 
         Args:
             max_missing_data_pairs: Maximum pairs to generate for missing data fallback
+            use_minhash_lsh: Add MinHash LSH name-similarity blocking
+            lsh_threshold: Estimated Jaccard similarity for LSH candidates
+            lsh_num_perm: Number of MinHash permutations
+            max_lsh_pairs: Maximum pairs to generate from MinHash LSH blocking
         """
         self.max_missing_data_pairs = max_missing_data_pairs
+        self.use_minhash_lsh = use_minhash_lsh
+        self.lsh_threshold = lsh_threshold
+        self.lsh_num_perm = lsh_num_perm
+        self.max_lsh_pairs = max_lsh_pairs
 
     def generate_candidate_pairs(self, df: pd.DataFrame) -> List[Tuple[int, int]]:
         """
@@ -51,6 +74,34 @@ class SmartBlockingStrategy:
         Returns:
             List of (index1, index2) tuples representing candidate pairs
         """
+        return list(self._collect_candidate_pairs(df))
+
+    def generate_candidate_pair_array(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Generate candidate pairs as a compact (N, 2) integer array.
+
+        Same pairs as generate_candidate_pairs, without a boxed tuple per pair.
+        Uses int32 when every index label fits, otherwise int64.
+
+        Args:
+            df: Input DataFrame (integer index)
+
+        Returns:
+            Array whose rows are (index1, index2) candidate pairs
+        """
+        all_pairs = self._collect_candidate_pairs(df)
+        pair_array = np.fromiter(
+            chain.from_iterable(all_pairs), dtype=np.int64, count=2 * len(all_pairs)
+        ).reshape(-1, 2)
+
+        int32_info = np.iinfo(np.int32)
+        if len(pair_array) == 0 or (pair_array.min() >= int32_info.min and pair_array.max() <= int32_info.max):
+            pair_array = pair_array.astype(np.int32)
+
+        return pair_array
+
+    def _collect_candidate_pairs(self, df: pd.DataFrame) -> Set[Tuple[int, int]]:
+        """Run every blocking strategy and return the union of their pairs."""
         all_pairs = set()
 
         # STRATEGY 1: SSN Token Blocking (if available)
@@ -96,6 +147,15 @@ class SmartBlockingStrategy:
         #     all_pairs.update(new_pairs)
         #     logger.info(f"Name token blocking: {len(new_pairs)} additional candidate pairs")
 
+        # STRATEGY 6b: MinHash LSH Name Blocking (opt-in)
+        # Finds similar names across geographic blocks without all-pairs comparison
+        if self.use_minhash_lsh:
+            pairs = self._block_by_minhash_lsh(df)
+            if pairs:
+                new_pairs = pairs - all_pairs
+                all_pairs.update(new_pairs)
+                logger.info(f"MinHash LSH blocking: {len(new_pairs)} additional candidate pairs")
+
         # STRATEGY 7: Limited Missing Data Fallback
         pairs = self._limited_missing_data_fallback(df, all_pairs)
         if pairs:
@@ -104,7 +164,7 @@ class SmartBlockingStrategy:
             logger.info(f"Limited missing data fallback: {len(new_pairs)} additional candidate pairs")
 
         logger.info(f"Total candidate pairs: {len(all_pairs)}")
-        return list(all_pairs)
+        return all_pairs
 
     def _block_by_ssn_token(self, df: pd.DataFrame) -> Set[Tuple[int, int]]:
         """Block by SSN token (exact matches only)."""
@@ -295,6 +355,75 @@ class SmartBlockingStrategy:
         indexer.block('name_token')
         return set(indexer.index(valid_token))
 
+    def _block_by_minhash_lsh(self, df: pd.DataFrame) -> Set[Tuple[int, int]]:
+        """
+        Block by name similarity using MinHash LSH over character 3-grams.
+
+        Each distinct name is hashed and queried once, so cost grows roughly
+        linearly with the number of names instead of quadratically within a block.
+        Uses name_match_key when present so suffix/abbreviation noise is ignored.
+
+        Pairs are name-level rather than all row pairs: every row is linked to
+        the first row of its name group, and each pair of similar names is
+        linked through their first rows. That is enough for clustering by
+        connected components and keeps a common name from producing a
+        quadratic number of pairs. Capped at max_lsh_pairs.
+        """
+        if not DATASKETCH_AVAILABLE:
+            logger.warning("datasketch not installed - skipping MinHash LSH blocking")
+            return set()
+
+        name_col = 'name_match_key' if 'name_match_key' in df.columns else 'name'
+        if name_col not in df.columns:
+            return set()
+
+        names = df[name_col][df[name_col].notna()].astype(str).str.strip().str.upper()
+        names = names[names != '']
+        if len(names) == 0:
+            return set()
+
+        # Rows sharing a name share a signature: hash each distinct name once
+        rows_by_name = names.groupby(names, sort=False).groups
+        distinct_names = list(rows_by_name)
+
+        shingle_sets = [
+            [name[i:i + 3].encode('utf-8') for i in range(max(1, len(name) - 2))]
+            for name in distinct_names
+        ]
+        minhashes = MinHash.bulk(shingle_sets, num_perm=self.lsh_num_perm)
+
+        lsh = MinHashLSH(threshold=self.lsh_threshold, num_perm=self.lsh_num_perm)
+        with lsh.insertion_session() as session:
+            for name_id, minhash in enumerate(minhashes):
+                session.insert(name_id, minhash)
+
+        # (higher, lower) like recordlinkage's dedup index, so overlaps dedupe
+        first_rows = [rows_by_name[name][0] for name in distinct_names]
+        same_name_pairs = (
+            (max(row, first_row), min(row, first_row))
+            for name, first_row in zip(distinct_names, first_rows)
+            for row in rows_by_name[name][1:]
+        )
+        similar_name_pairs = (
+            (max(first_rows[name_id], first_rows[other_id]), min(first_rows[name_id], first_rows[other_id]))
+            for name_id, minhash in enumerate(minhashes)
+            for other_id in lsh.query(minhash)
+            if other_id > name_id
+        )
+
+        pairs = set()
+        for pair in chain(same_name_pairs, similar_name_pairs):
+            pairs.add(pair)
+            if len(pairs) >= self.max_lsh_pairs:
+                logger.warning(
+                    f"Reached max_lsh_pairs limit ({self.max_lsh_pairs}). "
+                    f"Some similar names may not be linked."
+                )
+                break
+
+        logger.info(f"MinHash LSH: {len(pairs)} pairs from {len(distinct_names)} distinct names")
+        return pairs
+
     def _limited_missing_data_fallback(self, df: pd.DataFrame, existing_pairs: Set) -> Set[Tuple[int, int]]:
         """
         Limited fallback for records not covered by any blocking strategy.